@@ -0,0 +1,45 @@
+import logging
+import os
+import signal
+from types import FrameType
+
+from crossmint.client import MegaverseClient
+from crossmint.hedging import Hedger
+from crossmint.megaverse import Megaverse
+from crossmint.reconciler import Reconciler
+from crossmint.snapshot import megaverse_digest, open_snapshot
+
+SNAPSHOT_PATH = "megaverse.snapshot"
+INTERVAL = 30.0
+
+
+def reconcile() -> None:
+    logging.basicConfig(level=logging.INFO)
+    hedger = Hedger() if os.getenv("MEGAVERSE_HEDGING") else None
+    with MegaverseClient(hedger=hedger) as client:
+        goal = client.get_goal_map()["goal"]
+        rows, columns = len(goal), len(goal[0]) if goal else 0
+        path = os.getenv("MEGAVERSE_SNAPSHOT", SNAPSHOT_PATH)
+        megaverse = megaverse_digest(client.base_url, client.candidate_id)
+        with open_snapshot(path, rows, columns, megaverse) as snapshot:
+            reconciler = Reconciler(
+                Megaverse.from_snapshot(snapshot, client),
+                interval=float(os.getenv("RECONCILE_INTERVAL", INTERVAL)),
+            )
+
+            handlers = {signum: signal.getsignal(signum) for signum in (signal.SIGINT, signal.SIGTERM)}
+
+            def shutdown(signum: int, frame: FrameType | None) -> None:
+                reconciler.stop()
+                # A second signal aborts at once, without waiting for the ongoing operation.
+                for restored, handler in handlers.items():
+                    signal.signal(restored, handler if handler is not None else signal.SIG_DFL)
+
+            for signum in handlers:
+                signal.signal(signum, shutdown)
+            reconciler.run()
+    return
+
+
+if __name__ == "__main__":
+    reconcile()
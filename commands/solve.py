@@ -1,14 +1,26 @@
+import os
+
 from crossmint.client import MegaverseClient
+from crossmint.hedging import Hedger
 from crossmint.megaverse import Megaverse
+from crossmint.snapshot import megaverse_digest, open_snapshot
+
+SNAPSHOT_PATH = "megaverse.snapshot"
 
 
 def solve() -> None:
-    client = MegaverseClient()
-    current_megaverse = Megaverse(astral_objects={}, client=client)
-    goal_megaverse = Megaverse(astral_objects={}, client=client)
-    goal = client.get_goal_map()
-    goal_megaverse.load_goal(goal["goal"])
-    current_megaverse.convert(goal_megaverse)
+    hedger = Hedger() if os.getenv("MEGAVERSE_HEDGING") else None
+    with MegaverseClient(hedger=hedger) as client:
+        goal_megaverse = Megaverse(astral_objects={}, client=client)
+        goal = client.get_goal_map()
+        goal_megaverse.load_goal(goal["goal"])
+        rows, columns = len(goal["goal"]), len(goal["goal"][0]) if goal["goal"] else 0
+        path = os.getenv("MEGAVERSE_SNAPSHOT", SNAPSHOT_PATH)
+        megaverse = megaverse_digest(client.base_url, client.candidate_id)
+        with open_snapshot(path, rows, columns, megaverse) as snapshot:
+            current_megaverse = Megaverse.from_snapshot(snapshot, client)
+            goal_megaverse.validate_goal(current_megaverse)
+            current_megaverse.convert(goal_megaverse)
     return
 
 
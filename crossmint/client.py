@@ -1,31 +1,86 @@
+import json
+import logging
 import os
-from collections.abc import Callable
+from functools import partial
 from types import TracebackType
-from typing import Any
 
 import requests
 from dotenv import load_dotenv
-from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential
+from tenacity import Retrying, retry_if_exception_type, stop_after_attempt, wait_exponential
+from tenacity.wait import wait_base
 
-from crossmint.entities import Cometh, Polyanet, Soloon
-from crossmint.urls import COMETHS_ENDPOINT, MAP_ENDPOINT, MEGAVERSE_URL, POLYANETS_ENDPOINT, SOLOONS_ENDPOINT
+from crossmint.clock import Clock, SystemClock
+from crossmint.entities import Cometh, ComethDirection, Polyanet, Soloon, SoloonColor
+from crossmint.hedging import Hedger
+from crossmint.inflight import InFlightRegistry
+from crossmint.transport import Method, Operation, RequestsTransport, Timeout, Transport
+from crossmint.urls import (
+    COMETHS_ENDPOINT,
+    MAP_ENDPOINT,
+    MEGAVERSE_URL,
+    OBJECT_ENDPOINTS,
+    POLYANETS_ENDPOINT,
+    SOLOONS_ENDPOINT,
+)
 
+logger = logging.getLogger(__name__)
+
+# (connect, read) timeouts, in seconds.
+DEFAULT_TIMEOUT = (3.05, 10.0)
+RETRY_ATTEMPTS = 3
+RETRY_WAIT = wait_exponential(multiplier=1, min=4, max=10)
+
+
+def encode_attribute(name: str, value: str) -> bytes:
+    """JSON fragment `,"name":"value"` appended to a request body."""
+    return b"," + json.dumps({name: value}, separators=(",", ":"))[1:-1].encode()
+
+
+# Fragments of every attribute the client sends, encoded once instead of for each request.
+ATTRIBUTE_FRAGMENTS: dict[tuple[str, str], bytes] = {
+    **{("color", color): encode_attribute("color", color) for color in SoloonColor},
+    **{("direction", direction): encode_attribute("direction", direction) for direction in ComethDirection},
+}
 
-class MegaverseClient:
-    retry_on_rate_limit: Callable = retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=4, max=10),
-        retry=retry_if_exception_type(requests.exceptions.RequestException),
-    )
 
-    def __init__(self, base_url: str = MEGAVERSE_URL, candidate_id: str | None = None) -> None:
+class MegaverseClient:
+    def __init__(
+        self,
+        base_url: str = MEGAVERSE_URL,
+        candidate_id: str | None = None,
+        timeout: Timeout = DEFAULT_TIMEOUT,
+        hedger: Hedger | None = None,
+        transport: Transport | None = None,
+        clock: Clock | None = None,
+        retry_wait: wait_base = RETRY_WAIT,
+    ) -> None:
         if not candidate_id:
             load_dotenv()
 
         self.base_url = base_url.rstrip("/")
         self.candidate_id = candidate_id or os.getenv("CANDIDATE_ID")
         self._default_data = {"candidateId": self.candidate_id}
-        self.client = requests.Session()
+        self._urls = {endpoint: f"{self.base_url}/{endpoint}" for endpoint in OBJECT_ENDPOINTS}
+        self._goal_map_url = f"{self.base_url}/{MAP_ENDPOINT}/{self.candidate_id}/goal"
+        # Request body with the fixed data already encoded, leaving the position and the attributes to fill in.
+        self._body_template = (
+            json.dumps(self._default_data, separators=(",", ":"))[:-1].replace("%", "%%").encode()
+            + b',"row":%d,"column":%d%s}'
+        )
+        self.timeout = timeout
+        self.hedger = hedger
+        self.inflight = InFlightRegistry()
+        self.transport = transport or RequestsTransport()
+        self.clock = clock or SystemClock()
+        self.retrying = Retrying(
+            stop=stop_after_attempt(RETRY_ATTEMPTS),
+            wait=retry_wait,
+            retry=retry_if_exception_type(requests.exceptions.RequestException),
+            sleep=self.clock.sleep,
+        )
+
+    def __enter__(self) -> "MegaverseClient":
+        return self
 
     def __exit__(
         self,
@@ -33,85 +88,78 @@ class MegaverseClient:
         value: BaseException | None,
         traceback: TracebackType | None,
     ) -> None:
-        self.client.close()
+        logger.info(f"Operations: {self.inflight.stats}")
+        if self.hedger is not None:
+            logger.info(f"Hedging: {self.hedger.stats}")
+            # Before closing the transport, which losing hedged requests may still be using.
+            self.hedger.close()
+        self.transport.close()
         return None
 
     def __repr__(self) -> str:
         return f"MegaverseClient(base_url='{self.base_url}', candidate_id='****')"
 
-    def _make_request_data(self, **kwargs: Any) -> dict:
-        return {**self._default_data, **kwargs}
+    def _encode(self, operation: Operation) -> bytes:
+        attributes = b"".join(
+            ATTRIBUTE_FRAGMENTS.get(attribute) or encode_attribute(*attribute) for attribute in operation.attributes
+        )
+        return self._body_template % (operation.position.row, operation.position.column, attributes)
+
+    def _send_once(self, operation: Operation) -> None:
+        request = partial(
+            self.transport.request,
+            operation.method,
+            self._urls[operation.endpoint],
+            self._encode(operation),
+            self.timeout,
+        )
+        if self.hedger is None:
+            request()
+            return
+        self.hedger.run(request, key=(operation.position.row, operation.position.column))
+
+    def _send(self, operation: Operation) -> None:
+        self.retrying(self._send_once, operation)
+
+    def send(self, operation: Operation) -> None:
+        """Send `operation`, sharing the result of an equal one already pending on the same cell."""
+        self.inflight.run(operation, self._send)
+
+    def get_goal_map_content(self) -> bytes:
+        return self.transport.request(Method.GET, self._goal_map_url, timeout=self.timeout)
 
     def get_goal_map(self) -> dict:
-        response = self.client.get(f"{self.base_url}/{MAP_ENDPOINT}/{self.candidate_id}/goal")
-        response.raise_for_status()
-        goal_map: dict = response.json()
+        goal_map: dict = json.loads(self.get_goal_map_content())
         return goal_map
 
-    @retry_on_rate_limit
     def create_polyanet(self, polyanet: Polyanet) -> None:
-        response = self.client.post(
-            f"{self.base_url}/{POLYANETS_ENDPOINT}",
-            json=self._make_request_data(
-                row=polyanet.position.row,
-                column=polyanet.position.column,
-            ),
-        )
-        response.raise_for_status()
+        self.send(Operation(method=Method.POST, endpoint=POLYANETS_ENDPOINT, position=polyanet.position))
 
-    @retry_on_rate_limit
     def delete_polyanet(self, polyanet: Polyanet) -> None:
-        response = self.client.delete(
-            f"{self.base_url}/{POLYANETS_ENDPOINT}",
-            json=self._make_request_data(
-                row=polyanet.position.row,
-                column=polyanet.position.column,
-            ),
-        )
-        response.raise_for_status()
+        self.send(Operation(method=Method.DELETE, endpoint=POLYANETS_ENDPOINT, position=polyanet.position))
 
-    @retry_on_rate_limit
     def create_soloon(self, soloon: Soloon) -> None:
-        response = self.client.post(
-            f"{self.base_url}/{SOLOONS_ENDPOINT}",
-            json=self._make_request_data(
-                row=soloon.position.row,
-                column=soloon.position.column,
-                color=soloon.color,
-            ),
+        self.send(
+            Operation(
+                method=Method.POST,
+                endpoint=SOLOONS_ENDPOINT,
+                position=soloon.position,
+                attributes=(("color", soloon.color),),
+            )
         )
-        response.raise_for_status()
 
-    @retry_on_rate_limit
     def delete_soloon(self, soloon: Soloon) -> None:
-        response = self.client.delete(
-            f"{self.base_url}/{SOLOONS_ENDPOINT}",
-            json=self._make_request_data(
-                row=soloon.position.row,
-                column=soloon.position.column,
-            ),
-        )
-        response.raise_for_status()
+        self.send(Operation(method=Method.DELETE, endpoint=SOLOONS_ENDPOINT, position=soloon.position))
 
-    @retry_on_rate_limit
     def create_cometh(self, cometh: Cometh) -> None:
-        response = self.client.post(
-            f"{self.base_url}/{COMETHS_ENDPOINT}",
-            json=self._make_request_data(
-                row=cometh.position.row,
-                column=cometh.position.column,
-                direction=cometh.direction,
-            ),
+        self.send(
+            Operation(
+                method=Method.POST,
+                endpoint=COMETHS_ENDPOINT,
+                position=cometh.position,
+                attributes=(("direction", cometh.direction),),
+            )
         )
-        response.raise_for_status()
 
-    @retry_on_rate_limit
     def delete_cometh(self, cometh: Cometh) -> None:
-        response = self.client.delete(
-            f"{self.base_url}/{COMETHS_ENDPOINT}",
-            json=self._make_request_data(
-                row=cometh.position.row,
-                column=cometh.position.column,
-            ),
-        )
-        response.raise_for_status()
+        self.send(Operation(method=Method.DELETE, endpoint=COMETHS_ENDPOINT, position=cometh.position))
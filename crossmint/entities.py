@@ -42,7 +42,7 @@ class AstralObject(BaseModel):
     )
 
     def __hash__(self) -> int:
-        fields_values = tuple(getattr(self, field) for field in self.model_fields)
+        fields_values = tuple(getattr(self, field) for field in type(self).model_fields)
         return hash((type(self),) + fields_values)
 
 
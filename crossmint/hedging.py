@@ -0,0 +1,137 @@
+import threading
+from collections import deque
+from collections.abc import Callable, Hashable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from time import monotonic
+from typing import TypeVar
+
+T = TypeVar("T")
+
+
+class LatencyTracker:
+    """Sliding window of observed request latencies, in seconds."""
+
+    def __init__(self, window: int = 500, min_samples: int = 20) -> None:
+        self.min_samples = min_samples
+        self._samples: deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, q: float) -> float | None:
+        """Nearest-rank percentile of the window, or None until enough samples were observed."""
+        with self._lock:
+            if len(self._samples) < self.min_samples:
+                return None
+            samples = sorted(self._samples)
+        rank = max(0, min(len(samples) - 1, round(q / 100 * len(samples)) - 1))
+        return samples[rank]
+
+
+@dataclass
+class HedgeStats:
+    requests: int = 0
+    hedges: int = 0
+    wins: int = 0
+
+    @property
+    def win_rate(self) -> float:
+        return self.wins / self.hedges if self.hedges else 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.requests} requests, {self.hedges} hedged, "
+            f"{self.wins} won by the hedge ({self.win_rate:.0%} win rate)"
+        )
+
+
+class Hedger:
+    """Runs idempotent calls, sending a duplicate when the first one is slower than the observed percentile.
+
+    The number of hedges is capped to `budget` times the number of requests, so hedging never
+    consumes more than that fraction of extra rate limit. The slower of the two calls is not cancelled and
+    its result is discarded, but it can still change the server state after the faster one returned: the
+    next call with the same `key` waits for it first, and `close` waits for all of them.
+    """
+
+    def __init__(
+        self,
+        budget: float = 0.05,
+        percentile: float = 95,
+        tracker: LatencyTracker | None = None,
+        max_workers: int = 8,
+    ) -> None:
+        self.budget = budget
+        self.percentile = percentile
+        self.tracker = tracker or LatencyTracker()
+        self.stats = HedgeStats()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="hedge")
+        self._losers: dict[Hashable, Future] = {}
+
+    def _timed(self, fn: Callable[[], T]) -> T:
+        start = monotonic()
+        result = fn()
+        self.tracker.record(monotonic() - start)
+        return result
+
+    def _acquire_hedge(self) -> bool:
+        with self._lock:
+            if self.stats.hedges + 1 > self.budget * self.stats.requests:
+                return False
+            self.stats.hedges += 1
+            return True
+
+    def _settle(self, key: Hashable) -> None:
+        with self._lock:
+            loser = self._losers.get(key)
+        if loser is not None:
+            wait([loser])
+
+    def _release(self, key: Hashable, loser: Future) -> None:
+        with self._lock:
+            if self._losers.get(key) is loser:
+                del self._losers[key]
+
+    def _keep_loser(self, key: Hashable, loser: Future) -> None:
+        with self._lock:
+            self._losers[key] = loser
+        loser.add_done_callback(lambda future: self._release(key, future))
+
+    def run(self, fn: Callable[[], T], key: Hashable) -> T:
+        """Run `fn`, hedging it if slow. Calls changing the same server state must share the same `key`."""
+        self._settle(key)
+        with self._lock:
+            self.stats.requests += 1
+        delay = self.tracker.percentile(self.percentile)
+        if delay is None:
+            return self._timed(fn)
+
+        primary = self._executor.submit(self._timed, fn)
+        done, _ = wait([primary], timeout=delay)
+        if done or not self._acquire_hedge():
+            return primary.result()
+
+        hedge = self._executor.submit(self._timed, fn)
+        pending: set[Future[T]] = {primary, hedge}
+        while True:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            succeeded = [future for future in done if future.exception() is None]
+            if succeeded:
+                winner = primary if primary in succeeded else hedge
+                if winner is hedge:
+                    with self._lock:
+                        self.stats.wins += 1
+                if pending:
+                    self._keep_loser(key, pending.pop())
+                return winner.result()
+            if not pending:
+                # Both calls failed: surface the error of the primary one.
+                return primary.result()
+
+    def close(self) -> None:
+        """Wait for the calls still running, including the losing ones, and release the threads."""
+        self._executor.shutdown(wait=True)
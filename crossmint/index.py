@@ -0,0 +1,117 @@
+from collections.abc import Iterable, Iterator, Mapping, MutableMapping
+
+from crossmint.entities import AstralObject, Position
+
+TILE_SIZE = 8
+
+Tile = tuple[int, int]
+
+
+class TileIndex:
+    """Hierarchical digest of a megaverse: root -> rows of tiles -> tiles -> positions.
+
+    Each digest is the XOR of the hashes of the astral objects below it, so adding or removing an object
+    updates the three levels in constant time. Two indexes are compared top-down, only descending into the
+    rows and tiles whose digests differ. Hashes are only stable within a process, so indexes must not be
+    persisted.
+    """
+
+    def __init__(self, tile_size: int = TILE_SIZE) -> None:
+        if tile_size <= 0:
+            raise ValueError(f"Tile size must be positive, got {tile_size}")
+        self.tile_size = tile_size
+        self.digest = 0
+        self._row_digests: dict[int, int] = {}
+        self._tile_digests: dict[int, dict[int, int]] = {}
+        self._tile_positions: dict[Tile, set[Position]] = {}
+
+    @classmethod
+    def build(cls, astral_objects: Iterable[AstralObject], tile_size: int = TILE_SIZE) -> "TileIndex":
+        index = cls(tile_size)
+        for astral_object in astral_objects:
+            index.add(astral_object)
+        return index
+
+    def _tile(self, position: Position) -> Tile:
+        return position.row // self.tile_size, position.column // self.tile_size
+
+    def _toggle(self, astral_object: AstralObject) -> Tile:
+        tile_row, tile_column = tile = self._tile(astral_object.position)
+        object_hash = hash(astral_object)
+        self.digest ^= object_hash
+        self._row_digests[tile_row] = self._row_digests.get(tile_row, 0) ^ object_hash
+        row_tiles = self._tile_digests.setdefault(tile_row, {})
+        row_tiles[tile_column] = row_tiles.get(tile_column, 0) ^ object_hash
+        return tile
+
+    def add(self, astral_object: AstralObject) -> None:
+        tile = self._toggle(astral_object)
+        self._tile_positions.setdefault(tile, set()).add(astral_object.position)
+
+    def remove(self, astral_object: AstralObject) -> None:
+        tile_row, tile_column = tile = self._toggle(astral_object)
+        positions = self._tile_positions[tile]
+        positions.discard(astral_object.position)
+        if positions:
+            return
+        del self._tile_positions[tile]
+        del self._tile_digests[tile_row][tile_column]
+        if not self._tile_digests[tile_row]:
+            del self._tile_digests[tile_row]
+            del self._row_digests[tile_row]
+
+    def diff(self, other: "TileIndex") -> set[Position]:
+        """Positions, from either index, lying in a tile whose digest differs between both indexes."""
+        if self.tile_size != other.tile_size:
+            raise ValueError(f"Cannot compare indexes with tile sizes {self.tile_size} and {other.tile_size}")
+        positions: set[Position] = set()
+        if self.digest == other.digest:
+            return positions
+
+        for tile_row in self._row_digests.keys() | other._row_digests.keys():
+            if self._row_digests.get(tile_row, 0) == other._row_digests.get(tile_row, 0):
+                continue
+            tiles = self._tile_digests.get(tile_row, {})
+            other_tiles = other._tile_digests.get(tile_row, {})
+            for tile_column in tiles.keys() | other_tiles.keys():
+                if tiles.get(tile_column, 0) == other_tiles.get(tile_column, 0):
+                    continue
+                tile = (tile_row, tile_column)
+                positions |= self._tile_positions.get(tile, set())
+                positions |= other._tile_positions.get(tile, set())
+        return positions
+
+
+class IndexedMap(MutableMapping[Position, AstralObject]):
+    """Position -> astral object map updating its `TileIndex` on every change."""
+
+    def __init__(
+        self, astral_objects: Mapping[Position, AstralObject] | None = None, tile_size: int = TILE_SIZE
+    ) -> None:
+        self._objects: dict[Position, AstralObject] = {}
+        self.index = TileIndex(tile_size)
+        self.update(astral_objects or {})
+
+    def __getitem__(self, position: Position) -> AstralObject:
+        return self._objects[position]
+
+    def __setitem__(self, position: Position, astral_object: AstralObject) -> None:
+        if astral_object.position != position:
+            raise ValueError(f"{astral_object} cannot be stored at {position}")
+        previous = self._objects.get(position)
+        if previous is not None:
+            self.index.remove(previous)
+        self._objects[position] = astral_object
+        self.index.add(astral_object)
+
+    def __delitem__(self, position: Position) -> None:
+        self.index.remove(self._objects.pop(position))
+
+    def __iter__(self) -> Iterator[Position]:
+        return iter(self._objects)
+
+    def __len__(self) -> int:
+        return len(self._objects)
+
+    def __repr__(self) -> str:
+        return f"IndexedMap({self._objects!r})"
@@ -0,0 +1,122 @@
+import threading
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+
+from crossmint.transport import Method, Operation
+
+Cell = tuple[int, int]
+
+
+class SupersededError(Exception):
+    """Raised to the callers of a create dropped because a delete of the same object was queued after it."""
+
+
+@dataclass
+class InFlightStats:
+    sent: int = 0
+    deduplicated: int = 0
+    coalesced: int = 0
+
+    def __str__(self) -> str:
+        return f"{self.sent} sent, {self.deduplicated} deduplicated, {self.coalesced} coalesced"
+
+
+@dataclass
+class _Pending:
+    operation: Operation
+    future: Future[None] = field(default_factory=Future)
+
+
+@dataclass
+class _CellQueue:
+    pending: deque[_Pending] = field(default_factory=deque)
+    in_flight: _Pending | None = None
+
+
+def _supersedes(queued: Operation, operation: Operation) -> bool:
+    """Whether `operation` makes `queued` pointless to send.
+
+    A delete right after a create of the same object leaves the cell without that object whatever the create
+    did, so the create can be dropped. The delete must still be sent: the cell may already have held that object
+    before the create. Nothing is dropped for a delete followed by a create, whose outcome differs from the
+    create alone when the cell was not empty.
+    """
+    return (
+        queued.method is Method.POST
+        and operation.method is Method.DELETE
+        and queued.endpoint == operation.endpoint
+        and queued.position == operation.position
+    )
+
+
+class InFlightRegistry:
+    """Serialises the operations on each cell, merging the ones that are redundant before they are sent.
+
+    An operation equal to the last one pending (or in flight) on its cell attaches to its result instead of
+    being sent again, and a delete drops a create of the same object still waiting on the cell: the callers of
+    that create get a `SupersededError`, since the object was never created. The first caller on an
+    idle cell sends the operations queued for it until the cell is idle again; other callers wait for the
+    result of their own operation.
+    """
+
+    def __init__(self) -> None:
+        self.stats = InFlightStats()
+        self._lock = threading.Lock()
+        self._cells: dict[Cell, _CellQueue] = {}
+
+    def _enqueue(self, cell: _CellQueue, operation: Operation) -> Future[None]:
+        if cell.pending and _supersedes(cell.pending[-1].operation, operation):
+            superseded = cell.pending.pop()
+            superseded.future.set_exception(SupersededError(f"{superseded.operation} superseded by {operation}"))
+            self.stats.coalesced += 1
+        last = cell.pending[-1] if cell.pending else cell.in_flight
+        if last is not None and last.operation == operation:
+            self.stats.deduplicated += 1
+            return last.future
+        pending = _Pending(operation)
+        cell.pending.append(pending)
+        return pending.future
+
+    def _abandon(self, key: Cell, cell: _CellQueue) -> None:
+        """Cancel every operation left on the cell and free it, so that no caller waits for them forever."""
+        with self._lock:
+            del self._cells[key]
+            if cell.in_flight is not None:
+                cell.in_flight.future.cancel()
+            for pending in cell.pending:
+                pending.future.cancel()
+            cell.pending.clear()
+
+    def _drain(self, key: Cell, cell: _CellQueue, send: Callable[[Operation], None]) -> None:
+        try:
+            while True:
+                with self._lock:
+                    if not cell.pending:
+                        del self._cells[key]
+                        return
+                    pending = cell.in_flight = cell.pending.popleft()
+                    self.stats.sent += 1
+                try:
+                    send(pending.operation)
+                except Exception as e:
+                    pending.future.set_exception(e)
+                else:
+                    pending.future.set_result(None)
+        except BaseException:
+            # Interrupted (KeyboardInterrupt, SystemExit...) while sending: nobody is left to send the rest.
+            self._abandon(key, cell)
+            raise
+
+    def run(self, operation: Operation, send: Callable[[Operation], None]) -> None:
+        key = (operation.position.row, operation.position.column)
+        with self._lock:
+            cell = self._cells.get(key)
+            drive = cell is None
+            if cell is None:
+                cell = self._cells[key] = _CellQueue()
+            future = self._enqueue(cell, operation)
+        if drive:
+            self._drain(key, cell, send)
+        future.result()
@@ -1,6 +1,9 @@
 import logging
+from collections.abc import Callable, MutableMapping
+from dataclasses import dataclass
+from typing import Annotated, Any
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, PlainValidator, PrivateAttr, TypeAdapter
 
 from crossmint.client import MegaverseClient
 from crossmint.entities import (
@@ -13,16 +16,68 @@ from crossmint.entities import (
     Soloon,
     SoloonColor,
 )
+from crossmint.index import IndexedMap, TileIndex
+from crossmint.snapshot import MegaverseSnapshot
+from crossmint.validation import validate
 
 logger = logging.getLogger(__name__)
 
 MegaverseMap = dict[Position, AstralObject]
 
+_megaverse_map_adapter = TypeAdapter(MegaverseMap)
+
+
+def _indexed(astral_objects: Any) -> IndexedMap:
+    # Always a new map, even from another megaverse's: `convert` changes it in place.
+    if isinstance(astral_objects, IndexedMap):
+        return IndexedMap(astral_objects)
+    return IndexedMap(_megaverse_map_adapter.validate_python(astral_objects))
+
+
+@dataclass
+class ConvertStats:
+    created: int = 0
+    deleted: int = 0
+    interrupted: bool = False
+
 
 class Megaverse(BaseModel):
-    astral_objects: MegaverseMap
+    # Kept indexed on every change, including assignments, so that `convert` can trust `index`.
+    astral_objects: Annotated[MutableMapping[Position, AstralObject], PlainValidator(_indexed)]
     client: MegaverseClient
-    model_config = ConfigDict(arbitrary_types_allowed=True)
+    snapshot: MegaverseSnapshot | None = None
+    model_config = ConfigDict(arbitrary_types_allowed=True, validate_assignment=True)
+    _shape: tuple[int, int] | None = PrivateAttr(default=None)
+
+    @classmethod
+    def from_snapshot(cls, snapshot: MegaverseSnapshot, client: MegaverseClient) -> "Megaverse":
+        megaverse = cls(astral_objects=snapshot.astral_objects(), client=client, snapshot=snapshot)
+        megaverse._shape = (snapshot.rows, snapshot.columns)
+        return megaverse
+
+    @property
+    def index(self) -> TileIndex:
+        assert isinstance(self.astral_objects, IndexedMap)
+        return self.astral_objects.index
+
+    @property
+    def shape(self) -> tuple[int, int] | None:
+        """(rows, columns) of the loaded goal or snapshot, None when unknown."""
+        return self._shape
+
+    def validate_goal(self, target: "Megaverse") -> None:
+        """Check this goal can be applied to `target`, before any operation is sent."""
+        validate(self.astral_objects, target.shape, goal_shape=self._shape)
+
+    def _place(self, astral_object: AstralObject) -> None:
+        self.astral_objects[astral_object.position] = astral_object
+        if self.snapshot is not None:
+            self.snapshot.set(astral_object.position, astral_object)
+
+    def _remove(self, position: Position) -> None:
+        del self.astral_objects[position]
+        if self.snapshot is not None:
+            self.snapshot.set(position, None)
 
     def load_goal(self, goal: list[list[str]]) -> None:
         astral_objects: MegaverseMap = {}
@@ -30,6 +85,9 @@ class Megaverse(BaseModel):
             return
 
         logger.info(f"Loading a goal with size {len(goal)} x {len(goal[0])}")
+        ragged_rows = [i for i, row in enumerate(goal) if len(row) != len(goal[0])]
+        if ragged_rows:
+            raise ValueError(f"Goal rows {ragged_rows} do not have {len(goal[0])} columns")
         for i in range(len(goal)):
             for j in range(len(goal[0])):
                 match goal[i][j].split("_"):
@@ -59,7 +117,8 @@ class Megaverse(BaseModel):
                 if astral_object is AstralObjectType.COMETH:
                     assert astral_attr is not None
                     astral_objects[position] = Cometh(position=position, direction=ComethDirection(astral_attr))
-            self.astral_objects = astral_objects
+        self.astral_objects = astral_objects
+        self._shape = (len(goal), len(goal[0]))
         logger.info("Loading done")
         return
 
@@ -93,30 +152,73 @@ class Megaverse(BaseModel):
             return astral_object
         raise ValueError(f"Unhandled astral object type: {astral_object}")
 
-    def convert(self, goal_megaverse: "Megaverse") -> None:
-        current_positions = set(self.astral_objects.keys())
-        goal_positions = set(goal_megaverse.astral_objects.keys())
+    def _check_fits_snapshot(self, goal_megaverse: "Megaverse", positions: set[Position]) -> None:
+        """Reject a goal the snapshot cannot hold before any operation is sent, so that it never drifts."""
+        if self.snapshot is None:
+            return
+        shape = (self.snapshot.rows, self.snapshot.columns)
+        if goal_megaverse.shape not in (None, shape):
+            raise ValueError(f"Goal size {goal_megaverse.shape} does not match the snapshot size {shape}")
+        outside = sorted(
+            (position.row, position.column)
+            for position in positions
+            if position.row >= shape[0] or position.column >= shape[1]
+        )
+        if outside:
+            raise ValueError(f"Goal positions {outside} are outside of the snapshot size {shape}")
+
+    def convert(self, goal_megaverse: "Megaverse", should_stop: Callable[[], bool] | None = None) -> ConvertStats:
+        """Send the operations turning this megaverse into `goal_megaverse`.
+
+        `should_stop` is checked before each operation: once it returns True, the conversion stops early with
+        `interrupted` set, keeping the operations already confirmed.
+        """
+        # Only positions in tiles whose digests differ can hold a different object.
+        positions = self.index.diff(goal_megaverse.index)
+        current_positions = positions & self.astral_objects.keys()
+        goal_positions = positions & goal_megaverse.astral_objects.keys()
 
         positions_to_create = goal_positions - current_positions
         positions_to_delete = current_positions - goal_positions
         positions_to_check = current_positions & goal_positions
+        self._check_fits_snapshot(goal_megaverse, positions_to_create)
         logger.info(
             f"Creating {len(positions_to_create)} astral objects. "
             f"Deleting {len(positions_to_delete)} astral objects. "
             f"Checking {len(positions_to_check)} positions."
         )
+        stats = ConvertStats()
+
+        def stopped() -> bool:
+            if should_stop is None or not should_stop():
+                return False
+            logger.info(f"Stopped after creating {stats.created} and deleting {stats.deleted} astral objects")
+            stats.interrupted = True
+            return True
+
         for position in positions_to_delete:
+            if stopped():
+                return stats
             self._delete_astral_object(self.astral_objects[position])
+            self._remove(position)
+            stats.deleted += 1
 
         for position in positions_to_create:
-            self._create_astral_object(goal_megaverse.astral_objects[position])
+            if stopped():
+                return stats
+            self._place(self._create_astral_object(goal_megaverse.astral_objects[position]))
+            stats.created += 1
 
         for position in positions_to_check:
+            if stopped():
+                return stats
             current_object = self.astral_objects[position]
             goal_object = goal_megaverse.astral_objects[position]
             if current_object != goal_object:
                 self._delete_astral_object(current_object)
-                self._create_astral_object(goal_object)
-        self.astral_objects = goal_megaverse.astral_objects
+                self._remove(position)
+                stats.deleted += 1
+                self._place(self._create_astral_object(goal_object))
+                stats.created += 1
         logger.info("Done")
-        return
+        return stats
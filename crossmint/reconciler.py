@@ -0,0 +1,108 @@
+import hashlib
+import json
+import logging
+import threading
+from dataclasses import dataclass
+from time import monotonic
+
+import requests
+from tenacity import RetryError
+
+from crossmint.megaverse import Megaverse
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CycleStats:
+    cycle: int
+    changed: bool = False
+    created: int = 0
+    deleted: int = 0
+    failed: bool = False
+    interrupted: bool = False
+    duration: float = 0.0
+
+    def __str__(self) -> str:
+        if self.failed:
+            outcome = "failed"
+        elif self.interrupted:
+            outcome = f"interrupted, {self.created} created, {self.deleted} deleted"
+        elif self.changed:
+            outcome = f"goal changed, {self.created} created, {self.deleted} deleted"
+        else:
+            outcome = "goal unchanged"
+        return f"Cycle {self.cycle}: {outcome} in {self.duration:.2f}s"
+
+
+class Reconciler:
+    """Keeps `current` in sync with the goal map, polling it every `interval` seconds.
+
+    The goal is only parsed when the digest of the raw response changes, and `Megaverse.convert` only
+    issues operations for the tiles that differ, so an unchanged goal costs a single request per cycle.
+    A failed cycle keeps the operations already confirmed and is retried on the next one, unless the goal
+    itself is invalid or does not fit `current`: then nothing is sent until the goal changes. Errors other
+    than request failures, raised while converting, are not expected and stop the reconciler. `stop` is
+    also checked between operations, leaving the rest of an interrupted conversion to the next run.
+    """
+
+    def __init__(self, current: Megaverse, interval: float = 30.0) -> None:
+        self.current = current
+        self.client = current.client
+        self.interval = interval
+        self.cycles = 0
+        self._goal_digest: bytes | None = None
+        self._stop = threading.Event()
+
+    def stop(self) -> None:
+        """Ask the reconciler to stop once the ongoing operation is done."""
+        self._stop.set()
+
+    @property
+    def stopped(self) -> bool:
+        return self._stop.is_set()
+
+    def _load_goal(self, content: bytes) -> Megaverse:
+        goal_megaverse = Megaverse(astral_objects={}, client=self.client)
+        goal_megaverse.load_goal(json.loads(content)["goal"])
+        goal_megaverse.validate_goal(self.current)
+        return goal_megaverse
+
+    def run_cycle(self) -> CycleStats:
+        self.cycles += 1
+        stats = CycleStats(cycle=self.cycles)
+        start = monotonic()
+        try:
+            content = self.client.get_goal_map_content()
+            digest = hashlib.blake2b(content, digest_size=16).digest()
+            if digest != self._goal_digest:
+                stats.changed = True
+                try:
+                    goal_megaverse = self._load_goal(content)
+                except (KeyError, TypeError, ValueError):
+                    # The same goal would fail again: wait for it to change instead of retrying it.
+                    logger.exception(f"Cycle {stats.cycle}: invalid goal")
+                    stats.failed = True
+                    self._goal_digest = digest
+                else:
+                    convert_stats = self.current.convert(goal_megaverse, should_stop=lambda: self.stopped)
+                    stats.created, stats.deleted = convert_stats.created, convert_stats.deleted
+                    stats.interrupted = convert_stats.interrupted
+                    # An interrupted conversion is resumed by the next cycle, even if the goal is unchanged.
+                    if not convert_stats.interrupted:
+                        self._goal_digest = digest
+        except (requests.exceptions.RequestException, RetryError):
+            logger.exception(f"Cycle {stats.cycle} failed")
+            stats.failed = True
+        stats.duration = monotonic() - start
+        logger.info(stats)
+        return stats
+
+    def run(self, max_cycles: int | None = None) -> None:
+        while not self.stopped and (max_cycles is None or self.cycles < max_cycles):
+            self.run_cycle()
+            if max_cycles is not None and self.cycles >= max_cycles:
+                break
+            self._stop.wait(self.interval)
+        logger.info(f"Reconciler stopped after {self.cycles} cycles")
+        return
@@ -0,0 +1,106 @@
+import json
+from dataclasses import dataclass
+
+from tenacity import RetryError
+from tenacity.wait import wait_base
+
+from crossmint.client import RETRY_WAIT, MegaverseClient
+from crossmint.clock import SimulatedClock
+from crossmint.megaverse import Megaverse
+from crossmint.transport import InMemoryTransport, Method, Timeout, http_error
+
+
+class ThrottledTransport(InMemoryTransport):
+    """Fake API answering 429 beyond `rate` requests per second (with bursts up to `burst`), in simulated time.
+
+    Every request, throttled or not, takes `latency` simulated seconds.
+    """
+
+    def __init__(
+        self,
+        clock: SimulatedClock,
+        rate: float,
+        burst: int = 1,
+        latency: float = 0.1,
+        goal: list[list[str]] | None = None,
+    ) -> None:
+        super().__init__(goal=goal)
+        self.clock = clock
+        self.rate = rate
+        self.burst = burst
+        self.latency = latency
+        self.throttled = 0
+        self._tokens = float(burst)
+        self._updated = clock.monotonic()
+
+    def request(self, method: Method, url: str, body: bytes | None = None, timeout: Timeout | None = None) -> bytes:
+        self.clock.advance(self.latency)
+        now = self.clock.monotonic()
+        self._tokens = min(float(self.burst), self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        if self._tokens < 1:
+            self.throttled += 1
+            self.requests.append((method, url, json.loads(body) if body is not None else None))
+            raise http_error(url, 429, b'{"error": "Too Many Requests"}')
+        self._tokens -= 1
+        return super().request(method, url, body, timeout)
+
+
+@dataclass
+class SimulationReport:
+    operations: int
+    requests: int
+    throttled: int
+    failed_operations: int
+    rounds: int
+    elapsed: float
+    completed: bool
+
+    def __str__(self) -> str:
+        return (
+            f"{self.operations} operations {'completed' if self.completed else 'NOT completed'} "
+            f"in {self.elapsed / 3600:.2f}h over {self.rounds} rounds: {self.requests} requests, "
+            f"{self.throttled} throttled, {self.failed_operations} operations out of retries"
+        )
+
+
+def simulate(
+    goal: list[list[str]],
+    rate: float,
+    burst: int = 1,
+    latency: float = 0.1,
+    retry_wait: wait_base = RETRY_WAIT,
+    max_rounds: int = 100,
+) -> SimulationReport:
+    """Convert an empty megaverse into `goal` against a throttled fake API, in simulated time.
+
+    An operation running out of retries aborts the conversion, which is resumed in a new round from the
+    objects already created, as the reconcile loop would do.
+    """
+    clock = SimulatedClock()
+    transport = ThrottledTransport(clock, rate=rate, burst=burst, latency=latency)
+    client = MegaverseClient(candidate_id="simulation", transport=transport, clock=clock, retry_wait=retry_wait)
+    goal_megaverse = Megaverse(astral_objects={}, client=client)
+    goal_megaverse.load_goal(goal)
+    current_megaverse = Megaverse(astral_objects={}, client=client)
+
+    failed_operations = 0
+    completed = False
+    rounds = 0
+    while rounds < max_rounds and not completed:
+        rounds += 1
+        try:
+            current_megaverse.convert(goal_megaverse)
+            completed = True
+        except RetryError:
+            failed_operations += 1
+
+    return SimulationReport(
+        operations=len(goal_megaverse.astral_objects),
+        requests=len(transport.requests),
+        throttled=transport.throttled,
+        failed_operations=failed_operations,
+        rounds=rounds,
+        elapsed=clock.monotonic(),
+        completed=completed,
+    )
@@ -0,0 +1,198 @@
+import hashlib
+import logging
+import mmap
+import os
+import struct
+from pathlib import Path
+from types import TracebackType
+
+from crossmint.entities import (
+    AstralObject,
+    AstralObjectType,
+    Cometh,
+    ComethDirection,
+    Polyanet,
+    Position,
+    Soloon,
+    SoloonColor,
+)
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"MGVS"
+FORMAT_VERSION = 3
+# magic, format version, version stamp, rows, columns, grid checksum, digest of the mirrored megaverse.
+HEADER = struct.Struct("<4sHQIII16s")
+UNKNOWN_MEGAVERSE = bytes(16)
+# Largest prime below 2**32: the checksum fits in the header and changing any single cell changes it.
+CHECKSUM_MODULUS = 4_294_967_291
+
+SPACE_CODE = 0
+POLYANET_CODE = 1
+SOLOON_CODES = {color: 2 + i for i, color in enumerate(SoloonColor)}
+COMETH_CODES = {direction: 2 + len(SOLOON_CODES) + i for i, direction in enumerate(ComethDirection)}
+SOLOON_COLORS = {code: color for color, code in SOLOON_CODES.items()}
+COMETH_DIRECTIONS = {code: direction for direction, code in COMETH_CODES.items()}
+
+
+def encode(astral_object: AstralObject | None) -> int:
+    if astral_object is None:
+        return SPACE_CODE
+    if astral_object.type is AstralObjectType.POLYANET:
+        return POLYANET_CODE
+    if isinstance(astral_object, Soloon):
+        return SOLOON_CODES[astral_object.color]
+    if isinstance(astral_object, Cometh):
+        return COMETH_CODES[astral_object.direction]
+    raise ValueError(f"Unhandled astral object type: {astral_object}")
+
+
+def megaverse_digest(base_url: str, candidate_id: str | None) -> bytes:
+    """Identifies the megaverse a snapshot mirrors: the same map on another API or for another candidate differs."""
+    return hashlib.blake2b(f"{base_url}\n{candidate_id}".encode(), digest_size=16).digest()
+
+
+def checksum(grid: bytes | memoryview) -> int:
+    """Sum of the cell codes weighted by their offset plus one, so that it can be updated one cell at a time."""
+    return sum(offset * code for offset, code in enumerate(grid, start=1)) % CHECKSUM_MODULUS
+
+
+def decode(code: int, position: Position) -> AstralObject | None:
+    if code == SPACE_CODE:
+        return None
+    if code == POLYANET_CODE:
+        return Polyanet(position=position)
+    if code in SOLOON_COLORS:
+        return Soloon(position=position, color=SOLOON_COLORS[code])
+    if code in COMETH_DIRECTIONS:
+        return Cometh(position=position, direction=COMETH_DIRECTIONS[code])
+    raise ValueError(f"Unexpected cell code in snapshot: {code}")
+
+
+class MegaverseSnapshot:
+    """Memory-mapped local copy of a megaverse: a fixed header followed by one byte per cell, row-major.
+
+    Every `set` writes the cell in place, bumps the version stamp and updates the grid checksum in constant
+    time, so a snapshot whose checksum does not match its grid was modified or truncated outside of this class.
+    The header also records which megaverse the snapshot mirrors, see `megaverse_digest`.
+
+    Drift from the server is not detected: the snapshot only holds the operations confirmed to this client, so
+    objects changed by someone else or a reset of the megaverse on the server are not seen. Delete the snapshot
+    to start again from an empty megaverse.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._file = open(path, "r+b")
+        if os.fstat(self._file.fileno()).st_size < HEADER.size:
+            self._file.close()
+            raise ValueError(f"{path} is truncated")
+        self._map = mmap.mmap(self._file.fileno(), 0)
+        magic, format_version, _, self.rows, self.columns, _, self.megaverse = HEADER.unpack_from(self._map)
+        if magic != MAGIC or format_version != FORMAT_VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a megaverse snapshot (version {FORMAT_VERSION})")
+        if len(self._map) != HEADER.size + self.rows * self.columns:
+            self.close()
+            raise ValueError(f"{path} is truncated")
+
+    @classmethod
+    def create(
+        cls, path: str | os.PathLike, rows: int, columns: int, megaverse: bytes = UNKNOWN_MEGAVERSE
+    ) -> "MegaverseSnapshot":
+        grid = bytes(rows * columns)
+        with open(path, "wb") as snapshot_file:
+            snapshot_file.write(HEADER.pack(MAGIC, FORMAT_VERSION, 0, rows, columns, checksum(grid), megaverse))
+            snapshot_file.write(grid)
+        return cls(Path(path))
+
+    def __enter__(self) -> "MegaverseSnapshot":
+        return self
+
+    def __exit__(
+        self,
+        type_: type[BaseException] | None,
+        value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+        return None
+
+    def __repr__(self) -> str:
+        return f"MegaverseSnapshot(path='{self.path}', rows={self.rows}, columns={self.columns})"
+
+    @property
+    def version(self) -> int:
+        version: int = HEADER.unpack_from(self._map)[2]
+        return version
+
+    @property
+    def _grid(self) -> memoryview:
+        return memoryview(self._map)[HEADER.size :]
+
+    def _offset(self, position: Position) -> int:
+        if position.row >= self.rows or position.column >= self.columns:
+            raise ValueError(f"{position} is outside of the {self.rows} x {self.columns} snapshot")
+        offset: int = HEADER.size + position.row * self.columns + position.column
+        return offset
+
+    def get(self, position: Position) -> AstralObject | None:
+        return decode(self._map[self._offset(position)], position)
+
+    def set(self, position: Position, astral_object: AstralObject | None) -> None:
+        offset = self._offset(position)
+        code = encode(astral_object)
+        _, _, version, _, _, grid_checksum, _ = HEADER.unpack_from(self._map)
+        grid_checksum = (grid_checksum + (offset - HEADER.size + 1) * (code - self._map[offset])) % CHECKSUM_MODULUS
+        self._map[offset] = code
+        HEADER.pack_into(
+            self._map, 0, MAGIC, FORMAT_VERSION, version + 1, self.rows, self.columns, grid_checksum, self.megaverse
+        )
+
+    def is_consistent(self) -> bool:
+        grid_checksum: int = HEADER.unpack_from(self._map)[5]
+        with self._grid as grid:
+            return checksum(grid) == grid_checksum
+
+    def astral_objects(self) -> dict[Position, AstralObject]:
+        astral_objects: dict[Position, AstralObject] = {}
+        with self._grid as grid:
+            for offset, code in enumerate(grid):
+                if code == SPACE_CODE:
+                    continue
+                position = Position(row=offset // self.columns, column=offset % self.columns)
+                astral_object = decode(code, position)
+                assert astral_object is not None
+                astral_objects[position] = astral_object
+        return astral_objects
+
+    def flush(self) -> None:
+        self._map.flush()
+
+    def close(self) -> None:
+        self._map.close()
+        self._file.close()
+
+
+def open_snapshot(path: str | os.PathLike, rows: int, columns: int, megaverse: bytes) -> MegaverseSnapshot:
+    """Open the snapshot of `megaverse` at `path`.
+
+    A new, empty one is started instead if it is missing, unusable, of another size or mirrors another megaverse.
+    """
+    if os.path.exists(path):
+        try:
+            snapshot = MegaverseSnapshot(Path(path))
+        except ValueError as e:
+            logger.warning(f"Discarding snapshot: {e}")
+        else:
+            if (snapshot.rows, snapshot.columns) != (rows, columns):
+                logger.warning(f"Discarding snapshot with size {snapshot.rows} x {snapshot.columns}")
+            elif snapshot.megaverse != megaverse:
+                logger.warning(f"Discarding snapshot {path}: it mirrors another megaverse")
+            elif not snapshot.is_consistent():
+                logger.warning(f"Discarding snapshot {path}: checksum mismatch")
+            else:
+                logger.info(f"Loaded snapshot {path} at version {snapshot.version}")
+                return snapshot
+            snapshot.close()
+    return MegaverseSnapshot.create(path, rows, columns, megaverse)
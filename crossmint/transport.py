@@ -0,0 +1,125 @@
+import json
+from abc import ABC, abstractmethod
+from enum import StrEnum
+
+import requests
+import urllib3
+from pydantic import BaseModel, ConfigDict
+
+from crossmint.entities import Position
+
+Timeout = tuple[float, float]
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+class Method(StrEnum):
+    GET = "GET"
+    POST = "POST"
+    DELETE = "DELETE"
+
+
+class Operation(BaseModel):
+    """A create or delete request on a single cell, independent of the transport sending it."""
+
+    method: Method
+    endpoint: str
+    position: Position
+    attributes: tuple[tuple[str, str], ...] = ()
+    model_config = ConfigDict(frozen=True)
+
+
+def http_error(url: str, status: int, content: bytes) -> requests.exceptions.HTTPError:
+    response = requests.Response()
+    response.url = url
+    response.status_code = status
+    response._content = content
+    return requests.exceptions.HTTPError(f"{status} Error for url: {url}", response=response)
+
+
+class Transport(ABC):
+    """Sends HTTP requests for the client, with JSON bodies already encoded.
+
+    Failures are raised as `requests` exceptions, whatever the backend.
+    """
+
+    @abstractmethod
+    def request(self, method: Method, url: str, body: bytes | None = None, timeout: Timeout | None = None) -> bytes:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        return None
+
+
+class RequestsTransport(Transport):
+    def __init__(self) -> None:
+        self.session = requests.Session()
+        self.session.headers.update(JSON_HEADERS)
+
+    def request(self, method: Method, url: str, body: bytes | None = None, timeout: Timeout | None = None) -> bytes:
+        response = self.session.request(method, url, data=body, timeout=timeout)
+        response.raise_for_status()
+        return response.content
+
+    def close(self) -> None:
+        self.session.close()
+
+
+class Urllib3Transport(Transport):
+    """Bare urllib3 pool, skipping the per-request overhead of `requests` (hooks, adapters, cookies)."""
+
+    def __init__(self, maxsize: int = 16) -> None:
+        self.pool = urllib3.PoolManager(maxsize=maxsize, block=True, retries=False)
+
+    def request(self, method: Method, url: str, body: bytes | None = None, timeout: Timeout | None = None) -> bytes:
+        try:
+            response = self.pool.request(
+                method,
+                url,
+                body=body,
+                headers=JSON_HEADERS,
+                timeout=urllib3.Timeout(connect=timeout[0], read=timeout[1]) if timeout else None,
+            )
+        except urllib3.exceptions.NewConnectionError as e:
+            raise requests.exceptions.ConnectionError(e) from e
+        except urllib3.exceptions.TimeoutError as e:
+            raise requests.exceptions.Timeout(e) from e
+        except urllib3.exceptions.HTTPError as e:
+            raise requests.exceptions.ConnectionError(e) from e
+        if response.status >= 400:
+            raise http_error(url, response.status, response.data)
+        content: bytes = response.data
+        return content
+
+    def close(self) -> None:
+        self.pool.clear()
+
+
+class InMemoryTransport(Transport):
+    """Fake Megaverse API keeping the created objects in memory, for tests and benchmarks.
+
+    `failures` holds status codes returned, in order, by the next requests before they succeed.
+    """
+
+    def __init__(self, goal: list[list[str]] | None = None, failures: list[int] | None = None) -> None:
+        self.goal = goal or []
+        self.failures = list(failures or [])
+        self.requests: list[tuple[Method, str, dict | None]] = []
+        self.objects: dict[tuple[str, int, int], dict] = {}
+
+    def request(self, method: Method, url: str, body: bytes | None = None, timeout: Timeout | None = None) -> bytes:
+        data = json.loads(body) if body is not None else None
+        self.requests.append((method, url, data))
+        if self.failures:
+            raise http_error(url, self.failures.pop(0), b"")
+        if method is Method.GET:
+            return json.dumps({"goal": self.goal}).encode()
+
+        assert data is not None
+        endpoint = url.rsplit("/", 1)[-1]
+        key = (endpoint, data["row"], data["column"])
+        if method is Method.POST:
+            self.objects[key] = data
+        else:
+            self.objects.pop(key, None)
+        return b'{"ok": true}'
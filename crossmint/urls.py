@@ -4,3 +4,5 @@ POLYANETS_ENDPOINT = "polyanets"
 SOLOONS_ENDPOINT = "soloons"
 COMETHS_ENDPOINT = "comeths"
 MAP_ENDPOINT = "map"
+
+OBJECT_ENDPOINTS = (POLYANETS_ENDPOINT, SOLOONS_ENDPOINT, COMETHS_ENDPOINT)
@@ -0,0 +1,59 @@
+from collections.abc import Iterable, Mapping
+
+from crossmint.entities import AstralObject, AstralObjectType, Position
+
+Cell = tuple[int, int]
+
+NEIGHBOUR_OFFSETS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+
+
+class GoalValidationError(ValueError):
+    def __init__(self, violations: list[str]) -> None:
+        self.violations = violations
+        super().__init__(f"Invalid goal, {len(violations)} violations: " + "; ".join(violations))
+
+
+class NeighbourIndex:
+    """Object types by (row, column), so the neighbours of a cell are looked up without building positions."""
+
+    def __init__(self, astral_objects: Mapping[Position, AstralObject]) -> None:
+        self._types: dict[Cell, AstralObjectType] = {
+            (position.row, position.column): astral_object.type for position, astral_object in astral_objects.items()
+        }
+
+    def neighbours(self, position: Position) -> Iterable[AstralObjectType]:
+        for row_offset, column_offset in NEIGHBOUR_OFFSETS:
+            neighbour = self._types.get((position.row + row_offset, position.column + column_offset))
+            if neighbour is not None:
+                yield neighbour
+
+    def has_neighbour(self, position: Position, astral_object_type: AstralObjectType) -> bool:
+        return any(neighbour is astral_object_type for neighbour in self.neighbours(position))
+
+
+def validate(
+    astral_objects: Mapping[Position, AstralObject],
+    shape: tuple[int, int] | None,
+    goal_shape: tuple[int, int] | None = None,
+) -> None:
+    """Check a goal against the `shape` of the megaverse it is applied to, raising every violation at once.
+
+    The goal must have the same size as that megaverse when both are known, lie within its bounds and follow
+    the adjacency rules of the API.
+    """
+    violations: list[str] = []
+    if shape is not None and goal_shape is not None and goal_shape != shape:
+        violations.append(
+            f"Goal size {goal_shape[0]} x {goal_shape[1]} does not match the {shape[0]} x {shape[1]} megaverse"
+        )
+    index = NeighbourIndex(astral_objects)
+    for position, astral_object in astral_objects.items():
+        if shape is not None and (position.row >= shape[0] or position.column >= shape[1]):
+            violations.append(f"{position} is outside of the {shape[0]} x {shape[1]} megaverse")
+        if astral_object.type is AstralObjectType.SOLOON and not index.has_neighbour(
+            position, AstralObjectType.POLYANET
+        ):
+            violations.append(f"Soloon at {position} is not adjacent to a Polyanet")
+
+    if violations:
+        raise GoalValidationError(violations)
@@ -0,0 +1,86 @@
+import argparse
+import json
+import timeit
+
+import requests
+
+from crossmint.client import MegaverseClient
+from crossmint.entities import ComethDirection, Position, SoloonColor
+from crossmint.transport import InMemoryTransport, Method, Operation, RequestsTransport
+from crossmint.urls import COMETHS_ENDPOINT, POLYANETS_ENDPOINT, SOLOONS_ENDPOINT
+
+
+def operations(size: int) -> list[Operation]:
+    """One operation per cell of a `size` x `size` map, as a single convert sends them: no cell is repeated."""
+    variants = [
+        (Method.POST, POLYANETS_ENDPOINT, ()),
+        (Method.POST, SOLOONS_ENDPOINT, (("color", SoloonColor.RED),)),
+        (Method.POST, COMETHS_ENDPOINT, (("direction", ComethDirection.UP),)),
+        (Method.DELETE, POLYANETS_ENDPOINT, ()),
+    ]
+    return [
+        Operation(
+            method=method,
+            endpoint=endpoint,
+            position=Position(row=i // size, column=i % size),
+            attributes=attributes,
+        )
+        for i, (method, endpoint, attributes) in enumerate(variants[i % len(variants)] for i in range(size * size))
+    ]
+
+
+def reference_data(client: MegaverseClient, operation: Operation) -> dict:
+    """Request data as built before payloads were precompiled, by merging the client's data into a new dict."""
+    return {
+        "candidateId": client.candidate_id,
+        "row": operation.position.row,
+        "column": operation.position.column,
+        **dict(operation.attributes),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure the CPU cost of building a create/delete request.")
+    parser.add_argument("--size", type=int, default=100, help="Side of the map whose cells are each sent once")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    session = RequestsTransport().session
+
+    def per_call_payload(client: MegaverseClient, operation: Operation) -> requests.PreparedRequest:
+        # Request as built before payloads were precompiled: URL formatting, dict merging, JSON encoding.
+        data = reference_data(client, operation)
+        return session.prepare_request(
+            requests.Request(operation.method, f"{client.base_url}/{operation.endpoint}", json=data)
+        )
+
+    def precompiled_payload(client: MegaverseClient, operation: Operation) -> requests.PreparedRequest:
+        url, body = client._urls[operation.endpoint], client._encode(operation)
+        return session.prepare_request(requests.Request(operation.method, url, data=body))
+
+    def per_call_body(client: MegaverseClient, operation: Operation) -> bytes:
+        data = reference_data(client, operation)
+        return f"{client.base_url}/{operation.endpoint}".encode() + json.dumps(data).encode()
+
+    def precompiled_body(client: MegaverseClient, operation: Operation) -> bytes:
+        return client._urls[operation.endpoint].encode() + client._encode(operation)
+
+    benchmarks = {
+        "URL and body, per call": per_call_body,
+        "URL and body, precompiled": precompiled_body,
+        "session prepare, per call": per_call_payload,
+        "session prepare, precompiled": precompiled_payload,
+    }
+    for name, build in benchmarks.items():
+        timings = []
+        for _ in range(args.repeat):
+            # A new client and new operations for every run, so that nothing is reused from a previous one.
+            client = MegaverseClient(candidate_id="benchmark", transport=InMemoryTransport())
+            cold = operations(args.size)
+            timings.append(timeit.timeit(lambda: [build(client, operation) for operation in cold], number=1))
+        print(f"{name:>30}: {min(timings) / len(cold) * 1e6:6.2f} us/request")
+    return
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+import argparse
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from crossmint.client import MegaverseClient
+from crossmint.entities import Polyanet, Position
+from crossmint.transport import InMemoryTransport, RequestsTransport, Transport, Urllib3Transport
+
+
+class OkHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def _respond(self) -> None:
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        body = b'{"ok": true}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_POST = do_DELETE = _respond
+
+    def log_message(self, format: str, *args: object) -> None:
+        return None
+
+
+def benchmark(transport: Transport, base_url: str, operations: int) -> float:
+    client = MegaverseClient(base_url=base_url, candidate_id="benchmark", transport=transport)
+    start = time.perf_counter()
+    for i in range(operations):
+        polyanet = Polyanet(position=Position(row=i // 30, column=i % 30))
+        client.create_polyanet(polyanet)
+        client.delete_polyanet(polyanet)
+    elapsed = time.perf_counter() - start
+    transport.close()
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare the client transports against a local HTTP server.")
+    parser.add_argument("--operations", type=int, default=1000)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), OkHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    transports: dict[str, Transport] = {
+        "requests": RequestsTransport(),
+        "urllib3": Urllib3Transport(),
+        "in-memory": InMemoryTransport(),
+    }
+    for name, transport in transports.items():
+        elapsed = benchmark(transport, base_url, args.operations)
+        requests = 2 * args.operations
+        print(f"{name:>10}: {requests / elapsed:8.0f} requests/s ({elapsed / requests * 1e6:6.0f} us/request)")
+    server.shutdown()
+    return
+
+
+if __name__ == "__main__":
+    main()
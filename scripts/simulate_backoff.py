@@ -0,0 +1,35 @@
+import argparse
+import logging
+
+from tenacity import wait_exponential, wait_fixed, wait_random_exponential
+from tenacity.wait import wait_base
+
+from crossmint.client import RETRY_WAIT
+from crossmint.simulation import simulate
+
+POLICIES: dict[str, wait_base] = {
+    "default": RETRY_WAIT,
+    "fixed-1s": wait_fixed(1),
+    "exponential-1-30s": wait_exponential(multiplier=1, min=1, max=30),
+    "full-jitter-1-30s": wait_random_exponential(multiplier=1, max=30),
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare retry policies against a throttled API, in simulated time.")
+    parser.add_argument("--size", type=int, default=100, help="Side of the square goal full of Polyanets.")
+    parser.add_argument("--rate", type=float, default=1.0, help="Requests per second allowed by the API.")
+    parser.add_argument("--burst", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.2, help="Seconds per request.")
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    goal = [["POLYANET"] * args.size for _ in range(args.size)]
+    for name, policy in POLICIES.items():
+        report = simulate(goal, rate=args.rate, burst=args.burst, latency=args.latency, retry_wait=policy)
+        print(f"{name:>18}: {report}")
+    return
+
+
+if __name__ == "__main__":
+    main()
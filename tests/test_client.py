@@ -1,18 +1,27 @@
-from unittest.mock import Mock
+import json
+from unittest.mock import Mock, call
 
 import pytest
-from requests import Response, Session, exceptions
+from requests import Response, exceptions
 from requests_mock import Mocker
 from tenacity import RetryError
 
-from crossmint.client import MegaverseClient
+from crossmint.client import DEFAULT_TIMEOUT, MegaverseClient
+from crossmint.clock import SimulatedClock, SystemClock
 from crossmint.entities import Cometh, ComethDirection, Polyanet, Position, Soloon, SoloonColor
+from crossmint.hedging import Hedger, HedgeStats
+from crossmint.transport import InMemoryTransport, Method, Operation, Transport
 from crossmint.urls import COMETHS_ENDPOINT, MAP_ENDPOINT, MEGAVERSE_URL, POLYANETS_ENDPOINT, SOLOONS_ENDPOINT
 
 
 @pytest.fixture
-def client() -> MegaverseClient:
-    return MegaverseClient(candidate_id="test_id")
+def clock() -> SimulatedClock:
+    return SimulatedClock()
+
+
+@pytest.fixture
+def client(clock: SimulatedClock) -> MegaverseClient:
+    return MegaverseClient(candidate_id="test_id", clock=clock)
 
 
 @pytest.fixture
@@ -55,6 +64,9 @@ def test_client_initialization() -> None:
     client = MegaverseClient(candidate_id="test_id")
     assert client.candidate_id == "test_id"
     assert client.base_url == MEGAVERSE_URL
+    assert client.timeout == DEFAULT_TIMEOUT
+    assert client.hedger is None
+    assert isinstance(client.clock, SystemClock)
 
 
 def test_client_initialization_without_candidate_id(monkeypatch: pytest.MonkeyPatch) -> None:
@@ -63,11 +75,6 @@ def test_client_initialization_without_candidate_id(monkeypatch: pytest.MonkeyPa
     assert client.candidate_id == "env_test_id"
 
 
-def test_make_request_data(client: MegaverseClient) -> None:
-    data = client._make_request_data(test_key="test_value")
-    assert data == {"candidateId": "test_id", "test_key": "test_value"}
-
-
 def test_get_goal_map(client: MegaverseClient, requests_mock: Mocker, mock_goal_map_response: Response) -> None:
     requests_mock.get(
         f"{MEGAVERSE_URL}/{MAP_ENDPOINT}/test_id/goal",
@@ -189,6 +196,7 @@ def test_delete_methods(
 
 def test_retry_on_rate_limit(
     client: MegaverseClient,
+    clock: SimulatedClock,
     requests_mock: Mocker,
     mock_rate_limit_response: Response,
     mock_success_response: Response,
@@ -217,10 +225,12 @@ def test_retry_on_rate_limit(
     client.create_polyanet(polyanet)
 
     assert requests_mock.call_count == 3
+    assert clock.monotonic() == 8.0
 
 
 def test_retry_on_rate_limit_fails(
     client: MegaverseClient,
+    clock: SimulatedClock,
     requests_mock: Mocker,
     mock_rate_limit_response: Response,
 ) -> None:
@@ -250,9 +260,115 @@ def test_retry_on_rate_limit_fails(
         client.create_polyanet(polyanet)
 
     assert requests_mock.call_count == 3
+    assert clock.monotonic() == 8.0
+
+
+def test_requests_use_timeout(client: MegaverseClient) -> None:
+    client.transport = Mock(spec=Transport)
+    client.transport.request.return_value = b'{"goal": []}'
+    client.get_goal_map()
+    client.create_polyanet(Polyanet(position=Position(row=1, column=2)))
+
+    client.transport.request.assert_any_call(
+        Method.GET, f"{MEGAVERSE_URL}/{MAP_ENDPOINT}/test_id/goal", timeout=DEFAULT_TIMEOUT
+    )
+    client.transport.request.assert_called_with(
+        Method.POST,
+        f"{MEGAVERSE_URL}/{POLYANETS_ENDPOINT}",
+        b'{"candidateId":"test_id","row":1,"column":2}',
+        DEFAULT_TIMEOUT,
+    )
+
+
+def test_hedged_request(requests_mock: Mocker, mock_success_response: Response) -> None:
+    requests_mock.post(
+        f"{MEGAVERSE_URL}/{POLYANETS_ENDPOINT}",
+        status_code=mock_success_response.status_code,
+        content=mock_success_response._content or b"",
+    )
+    hedger = Mock(spec=Hedger, wraps=Hedger())
+    client = MegaverseClient(candidate_id="test_id", hedger=hedger)
+
+    client.create_polyanet(Polyanet(position=Position(row=1, column=2)))
+
+    hedger.run.assert_called_once()
+    assert requests_mock.call_count == 1
 
 
 def test_client_exit(client: MegaverseClient) -> None:
-    client.client = Mock(spec=Session)
+    client.transport = Mock(spec=Transport)
     client.__exit__(None, None, None)
-    client.client.close.assert_called_once()
+    client.transport.close.assert_called_once()
+
+
+def test_client_context_manager_with_hedger() -> None:
+    hedger = Mock(spec=Hedger, stats=HedgeStats())
+    transport = Mock(spec=Transport)
+    closed = Mock()
+    closed.attach_mock(hedger.close, "hedger")
+    closed.attach_mock(transport.close, "transport")
+    with MegaverseClient(candidate_id="test_id", hedger=hedger, transport=transport):
+        pass
+    assert closed.mock_calls == [call.hedger(), call.transport()]
+
+
+def test_send_with_in_memory_transport() -> None:
+    transport = InMemoryTransport(goal=[["POLYANET"]])
+    client = MegaverseClient(candidate_id="test_id", transport=transport)
+
+    assert client.get_goal_map() == {"goal": [["POLYANET"]]}
+    client.create_soloon(Soloon(position=Position(row=1, column=2), color=SoloonColor.RED))
+    client.create_cometh(Cometh(position=Position(row=0, column=0), direction=ComethDirection.UP))
+    client.delete_cometh(Cometh(position=Position(row=0, column=0), direction=ComethDirection.UP))
+
+    assert transport.objects == {
+        (SOLOONS_ENDPOINT, 1, 2): {"candidateId": "test_id", "row": 1, "column": 2, "color": "red"},
+    }
+    assert [method for method, _, _ in transport.requests] == [Method.GET, Method.POST, Method.POST, Method.DELETE]
+
+
+def test_send_goes_through_inflight_registry() -> None:
+    client = MegaverseClient(candidate_id="test_id", transport=InMemoryTransport())
+
+    client.create_polyanet(Polyanet(position=Position(row=1, column=2)))
+
+    assert client.inflight.stats.sent == 1
+
+
+def test_request_body(client: MegaverseClient, requests_mock: Mocker) -> None:
+    requests_mock.post(f"{MEGAVERSE_URL}/{SOLOONS_ENDPOINT}", status_code=200)
+
+    client.create_soloon(Soloon(position=Position(row=1, column=2), color=SoloonColor.RED))
+
+    assert requests_mock.last_request is not None
+    assert requests_mock.last_request.headers["Content-Type"] == "application/json"
+    assert requests_mock.last_request.body == b'{"candidateId":"test_id","row":1,"column":2,"color":"red"}'
+
+
+@pytest.mark.parametrize("candidate_id", ["test_id", '100%"quoted"'])
+def test_encode_matches_json(candidate_id: str) -> None:
+    client = MegaverseClient(candidate_id=candidate_id, transport=InMemoryTransport())
+    operations = [
+        Operation(method=Method.DELETE, endpoint=POLYANETS_ENDPOINT, position=Position(row=0, column=31)),
+        Operation(
+            method=Method.POST,
+            endpoint=COMETHS_ENDPOINT,
+            position=Position(row=7, column=1),
+            attributes=(("direction", ComethDirection.LEFT),),
+        ),
+        Operation(
+            method=Method.POST,
+            endpoint=SOLOONS_ENDPOINT,
+            position=Position(row=2, column=3),
+            attributes=(("color", "ünknown"), ("size", "big")),
+        ),
+    ]
+
+    for operation in operations:
+        data = {
+            "candidateId": candidate_id,
+            "row": operation.position.row,
+            "column": operation.position.column,
+            **dict(operation.attributes),
+        }
+        assert client._encode(operation) == json.dumps(data, separators=(",", ":")).encode()
@@ -0,0 +1,22 @@
+import time
+
+from crossmint.clock import SimulatedClock, SystemClock
+
+
+def test_system_clock() -> None:
+    clock = SystemClock()
+    start = clock.monotonic()
+    clock.sleep(0.01)
+    assert clock.monotonic() - start >= 0.01
+    assert abs(clock.monotonic() - time.monotonic()) < 1
+
+
+def test_simulated_clock() -> None:
+    clock = SimulatedClock(start=10.0)
+    assert clock.monotonic() == 10.0
+
+    clock.sleep(3600)
+    clock.advance(0.5)
+    clock.advance(-1)
+
+    assert clock.monotonic() == 3610.5
@@ -0,0 +1,169 @@
+import threading
+import time
+from collections.abc import Iterator
+
+import pytest
+
+from crossmint.client import MegaverseClient
+from crossmint.entities import Position, Soloon, SoloonColor
+from crossmint.hedging import Hedger, HedgeStats, LatencyTracker
+from crossmint.megaverse import Megaverse
+from crossmint.transport import InMemoryTransport, Method, Timeout
+from crossmint.urls import SOLOONS_ENDPOINT
+
+
+class TestLatencyTracker:
+    def test_percentile_needs_min_samples(self) -> None:
+        tracker = LatencyTracker(min_samples=3)
+        tracker.record(1.0)
+        tracker.record(2.0)
+        assert tracker.percentile(95) is None
+
+    def test_percentile(self) -> None:
+        tracker = LatencyTracker(min_samples=1)
+        for seconds in range(1, 101):
+            tracker.record(seconds / 100)
+        assert tracker.percentile(95) == 0.95
+        assert tracker.percentile(0) == 0.01
+        assert tracker.percentile(100) == 1.0
+
+    def test_window(self) -> None:
+        tracker = LatencyTracker(window=2, min_samples=1)
+        for seconds in (10.0, 1.0, 2.0):
+            tracker.record(seconds)
+        assert tracker.percentile(100) == 2.0
+
+
+class TestHedgeStats:
+    def test_win_rate(self) -> None:
+        assert HedgeStats().win_rate == 0.0
+        stats = HedgeStats(requests=10, hedges=4, wins=1)
+        assert stats.win_rate == 0.25
+        assert str(stats) == "10 requests, 4 hedged, 1 won by the hedge (25% win rate)"
+
+
+@pytest.fixture
+def hedger() -> Iterator[Hedger]:
+    tracker = LatencyTracker(min_samples=1)
+    tracker.record(0.01)
+    hedger = Hedger(budget=1.0, tracker=tracker)
+    yield hedger
+    hedger.close()
+
+
+class SlowFirstCall:
+    """Callable whose first invocation is slow (and optionally fails), while later ones are fast."""
+
+    def __init__(self, delay: float = 0.5, fail_first: bool = False, fail_others: bool = False) -> None:
+        self.delay = delay
+        self.fail_first = fail_first
+        self.fail_others = fail_others
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self) -> int:
+        with self._lock:
+            self.calls += 1
+            call = self.calls
+        if call == 1:
+            time.sleep(self.delay)
+            if self.fail_first:
+                raise RuntimeError("first")
+        elif self.fail_others:
+            raise RuntimeError("other")
+        return call
+
+
+class TestHedger:
+    def test_no_hedge_without_samples(self) -> None:
+        hedger = Hedger(budget=1.0)
+        assert hedger.run(lambda: 1, key="cell") == 1
+        assert hedger.stats == HedgeStats(requests=1, hedges=0, wins=0)
+        assert hedger.tracker.percentile(0) is None
+
+    def test_fast_call_is_not_hedged(self, hedger: Hedger) -> None:
+        assert hedger.run(lambda: 1, key="cell") == 1
+        assert hedger.stats.hedges == 0
+
+    def test_slow_call_is_hedged(self, hedger: Hedger) -> None:
+        call = SlowFirstCall()
+        assert hedger.run(call, key="cell") == 2
+        assert hedger.stats == HedgeStats(requests=1, hedges=1, wins=1)
+
+    def test_hedge_budget(self, hedger: Hedger) -> None:
+        hedger.budget = 0.0
+        call = SlowFirstCall(delay=0.05)
+        assert hedger.run(call, key="cell") == 1
+        assert call.calls == 1
+        assert hedger.stats.hedges == 0
+
+    def test_primary_wins_when_hedge_fails(self, hedger: Hedger) -> None:
+        call = SlowFirstCall(delay=0.05, fail_others=True)
+        assert hedger.run(call, key="cell") == 1
+        assert hedger.stats == HedgeStats(requests=1, hedges=1, wins=0)
+
+    def test_both_fail(self, hedger: Hedger) -> None:
+        call = SlowFirstCall(delay=0.05, fail_first=True, fail_others=True)
+        with pytest.raises(RuntimeError, match="first"):
+            hedger.run(call, key="cell")
+
+    def test_keyed_call_waits_for_loser(self, hedger: Hedger) -> None:
+        call = SlowFirstCall(delay=0.3)
+        start = time.monotonic()
+        assert hedger.run(call, key="cell") == 2
+        assert time.monotonic() - start < 0.3
+
+        assert hedger.run(lambda: 3, key="cell") == 3
+        assert time.monotonic() - start >= 0.3
+        assert hedger._losers == {}
+
+    def test_other_keys_do_not_wait_for_loser(self, hedger: Hedger) -> None:
+        call = SlowFirstCall(delay=0.3)
+        start = time.monotonic()
+        hedger.run(call, key="cell")
+
+        assert hedger.run(lambda: 3, key="other cell") == 3
+        assert time.monotonic() - start < 0.3
+
+    def test_close_waits_for_loser(self, hedger: Hedger) -> None:
+        call = SlowFirstCall(delay=0.1)
+        start = time.monotonic()
+        assert hedger.run(call, key="cell") == 2
+        assert time.monotonic() - start < 0.1
+
+        hedger.close()
+        assert time.monotonic() - start >= 0.1
+        assert hedger._losers == {}
+
+
+class SlowFirstDeleteTransport(InMemoryTransport):
+    def __init__(self) -> None:
+        super().__init__()
+        self.deletes = 0
+
+    def request(self, method: Method, url: str, body: bytes | None = None, timeout: Timeout | None = None) -> bytes:
+        if method is Method.DELETE:
+            self.deletes += 1
+            if self.deletes == 1:
+                time.sleep(0.3)
+        return super().request(method, url, body, timeout)
+
+
+def test_hedged_delete_followed_by_create_on_same_cell(hedger: Hedger) -> None:
+    transport = SlowFirstDeleteTransport()
+    client = MegaverseClient(candidate_id="test_id", transport=transport, hedger=hedger)
+    position = Position(row=0, column=0)
+    red = Soloon(position=position, color=SoloonColor.RED)
+    blue = Soloon(position=position, color=SoloonColor.BLUE)
+    client.create_soloon(red)
+    megaverse = Megaverse(astral_objects={position: red}, client=client)
+
+    megaverse.convert(Megaverse(astral_objects={position: blue}, client=client))
+    # Let the losing delete land before checking the server state.
+    hedger._executor.shutdown(wait=True)
+
+    assert hedger.stats.wins == 1
+    assert transport.objects == {
+        (SOLOONS_ENDPOINT, 0, 0): {"candidateId": "test_id", "row": 0, "column": 0, "color": "blue"}
+    }
+    assert megaverse.astral_objects == {position: blue}
@@ -0,0 +1,79 @@
+import pytest
+
+from crossmint.entities import Cometh, ComethDirection, Polyanet, Position, Soloon, SoloonColor
+from crossmint.index import IndexedMap, TileIndex
+
+
+class TestTileIndex:
+    @pytest.fixture
+    def astral_objects(self) -> list:
+        return [
+            Polyanet(position=Position(row=0, column=0)),
+            Soloon(position=Position(row=0, column=1), color=SoloonColor.RED),
+            Cometh(position=Position(row=5, column=9), direction=ComethDirection.UP),
+        ]
+
+    def test_invalid_tile_size(self) -> None:
+        with pytest.raises(ValueError, match="Tile size must be positive"):
+            TileIndex(tile_size=0)
+
+    def test_equal_indexes(self, astral_objects: list) -> None:
+        index = TileIndex.build(astral_objects, tile_size=4)
+        other = TileIndex.build(reversed(astral_objects), tile_size=4)
+
+        assert index.digest == other.digest
+        assert index.diff(other) == set()
+
+    def test_diff_only_changed_tiles(self, astral_objects: list) -> None:
+        index = TileIndex.build(astral_objects, tile_size=4)
+        changed = Soloon(position=Position(row=0, column=1), color=SoloonColor.BLUE)
+        other = TileIndex.build([astral_objects[0], changed, astral_objects[2]], tile_size=4)
+
+        assert index.diff(other) == {Position(row=0, column=0), Position(row=0, column=1)}
+        assert other.diff(index) == {Position(row=0, column=0), Position(row=0, column=1)}
+
+    def test_diff_missing_tiles(self, astral_objects: list) -> None:
+        index = TileIndex.build(astral_objects, tile_size=4)
+        empty = TileIndex(tile_size=4)
+
+        assert index.diff(empty) == {astral_object.position for astral_object in astral_objects}
+        assert empty.diff(index) == {astral_object.position for astral_object in astral_objects}
+
+    def test_diff_tile_size_mismatch(self) -> None:
+        with pytest.raises(ValueError, match="Cannot compare indexes"):
+            TileIndex(tile_size=4).diff(TileIndex(tile_size=8))
+
+    def test_add_remove(self, astral_objects: list) -> None:
+        index = TileIndex.build(astral_objects)
+        for astral_object in astral_objects:
+            index.remove(astral_object)
+
+        assert index.digest == 0
+        assert index.diff(TileIndex()) == set()
+
+    def test_remove_keeps_other_objects_in_tile(self, astral_objects: list) -> None:
+        index = TileIndex.build(astral_objects)
+        index.remove(astral_objects[0])
+
+        assert index.diff(TileIndex.build(astral_objects[1:])) == set()
+
+
+class TestIndexedMap:
+    def test_index_follows_changes(self) -> None:
+        polyanet = Polyanet(position=Position(row=0, column=0))
+        soloon = Soloon(position=Position(row=0, column=0), color=SoloonColor.RED)
+        cometh = Cometh(position=Position(row=5, column=9), direction=ComethDirection.UP)
+        astral_objects = IndexedMap({polyanet.position: polyanet})
+
+        astral_objects[soloon.position] = soloon
+        astral_objects[cometh.position] = cometh
+        del astral_objects[cometh.position]
+
+        assert astral_objects == {soloon.position: soloon}
+        assert len(astral_objects) == 1
+        assert repr(astral_objects) == f"IndexedMap({ {soloon.position: soloon}!r})"
+        assert astral_objects.index.diff(TileIndex.build([soloon])) == set()
+
+    def test_wrong_position(self) -> None:
+        with pytest.raises(ValueError, match="cannot be stored at"):
+            IndexedMap({Position(row=1, column=1): Polyanet(position=Position(row=0, column=0))})
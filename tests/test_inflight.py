@@ -0,0 +1,256 @@
+import threading
+import time
+from collections.abc import Callable
+
+import pytest
+
+from crossmint.client import MegaverseClient
+from crossmint.entities import Position, Soloon, SoloonColor
+from crossmint.inflight import InFlightRegistry, InFlightStats, SupersededError
+from crossmint.transport import InMemoryTransport, Method, Operation
+from crossmint.urls import COMETHS_ENDPOINT, POLYANETS_ENDPOINT, SOLOONS_ENDPOINT
+
+CREATE = Operation(method=Method.POST, endpoint=POLYANETS_ENDPOINT, position=Position(row=1, column=1))
+DELETE = Operation(method=Method.DELETE, endpoint=POLYANETS_ENDPOINT, position=Position(row=1, column=1))
+CREATE_SOLOON = Operation(
+    method=Method.POST,
+    endpoint=SOLOONS_ENDPOINT,
+    position=Position(row=1, column=1),
+    attributes=(("color", "red"),),
+)
+
+
+class BlockingSender:
+    """Records the operations sent, blocking the first one until `release` is called, then passes them to `forward`."""
+
+    def __init__(
+        self,
+        fail: bool = False,
+        error: type[BaseException] = RuntimeError,
+        forward: Callable[[Operation], None] | None = None,
+    ) -> None:
+        self.sent: list[Operation] = []
+        self.fail = fail
+        self.error = error
+        self.forward = forward
+        self._started = threading.Event()
+        self._released = threading.Event()
+
+    def __call__(self, operation: Operation) -> None:
+        self.sent.append(operation)
+        if len(self.sent) == 1:
+            self._started.set()
+            self._released.wait(timeout=5)
+        if self.fail:
+            raise self.error("API error")
+        if self.forward is not None:
+            self.forward(operation)
+
+    def wait_started(self) -> None:
+        assert self._started.wait(timeout=5)
+
+    def release(self) -> None:
+        self._released.set()
+
+
+def wait_for(condition: Callable[[], bool]) -> None:
+    deadline = time.monotonic() + 5
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.001)
+
+
+def run_in_thread(registry: InFlightRegistry, operation: Operation, send: BlockingSender) -> threading.Thread:
+    thread = threading.Thread(target=registry.run, args=(operation, send))
+    thread.start()
+    return thread
+
+
+def test_stats_str() -> None:
+    assert str(InFlightStats(sent=3, deduplicated=2, coalesced=1)) == "3 sent, 2 deduplicated, 1 coalesced"
+
+
+def test_sequential_operations_are_sent() -> None:
+    registry = InFlightRegistry()
+    sent: list[Operation] = []
+
+    registry.run(CREATE, sent.append)
+    registry.run(CREATE, sent.append)
+
+    assert sent == [CREATE, CREATE]
+    assert registry.stats == InFlightStats(sent=2)
+
+
+def test_duplicate_attaches_to_in_flight() -> None:
+    registry = InFlightRegistry()
+    send = BlockingSender()
+    first = run_in_thread(registry, CREATE, send)
+    send.wait_started()
+    second = run_in_thread(registry, CREATE, send)
+    wait_for(lambda: registry.stats.deduplicated == 1)
+
+    send.release()
+    first.join()
+    second.join()
+
+    assert send.sent == [CREATE]
+    assert registry.stats == InFlightStats(sent=1, deduplicated=1)
+
+
+def test_duplicate_attaches_to_pending() -> None:
+    registry = InFlightRegistry()
+    send = BlockingSender()
+    threads = [run_in_thread(registry, CREATE, send)]
+    send.wait_started()
+    threads += [run_in_thread(registry, DELETE, send)]
+    wait_for(lambda: registry.stats.sent == 1 and len(registry._cells[(1, 1)].pending) == 1)
+    threads += [run_in_thread(registry, DELETE, send)]
+    wait_for(lambda: registry.stats.deduplicated == 1)
+
+    send.release()
+    for thread in threads:
+        thread.join()
+
+    assert send.sent == [CREATE, DELETE]
+    assert registry.stats == InFlightStats(sent=2, deduplicated=1)
+
+
+def run_superseded(
+    registry: InFlightRegistry, operation: Operation, send: BlockingSender, errors: list[SupersededError]
+) -> threading.Thread:
+    """Run `operation` in a thread, collecting the `SupersededError` it is expected to raise in `errors`."""
+
+    def run() -> None:
+        try:
+            registry.run(operation, send)
+        except SupersededError as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    return thread
+
+
+def test_delete_supersedes_queued_create() -> None:
+    registry = InFlightRegistry()
+    send = BlockingSender()
+    threads = [run_in_thread(registry, CREATE_SOLOON, send)]
+    send.wait_started()
+    errors: list[SupersededError] = []
+    threads += [run_superseded(registry, CREATE, send, errors)]
+    wait_for(lambda: len(registry._cells[(1, 1)].pending) == 1)
+    threads += [run_in_thread(registry, DELETE, send)]
+    wait_for(lambda: registry.stats.coalesced == 1)
+
+    send.release()
+    for thread in threads:
+        thread.join()
+
+    assert send.sent == [CREATE_SOLOON, DELETE]
+    assert registry.stats == InFlightStats(sent=2, coalesced=1)
+    assert len(errors) == 1
+    assert registry._cells == {}
+
+
+def test_superseded_create_still_deletes_existing_object() -> None:
+    transport = InMemoryTransport()
+    client = MegaverseClient(candidate_id="test_id", transport=transport)
+    position = Position(row=1, column=1)
+    client.create_soloon(Soloon(position=position, color=SoloonColor.RED))
+    registry = InFlightRegistry()
+    send = BlockingSender(forward=client._send)
+    delete_cometh = Operation(method=Method.DELETE, endpoint=COMETHS_ENDPOINT, position=position)
+    create_blue = CREATE_SOLOON.model_copy(update={"attributes": (("color", "blue"),)})
+    delete_soloon = Operation(method=Method.DELETE, endpoint=SOLOONS_ENDPOINT, position=position)
+
+    threads = [run_in_thread(registry, delete_cometh, send)]
+    send.wait_started()
+    errors: list[SupersededError] = []
+    threads += [run_superseded(registry, create_blue, send, errors)]
+    wait_for(lambda: len(registry._cells[(1, 1)].pending) == 1)
+    threads += [run_in_thread(registry, delete_soloon, send)]
+    wait_for(lambda: registry.stats.coalesced == 1)
+
+    send.release()
+    for thread in threads:
+        thread.join()
+
+    assert send.sent == [delete_cometh, delete_soloon]
+    assert transport.objects == {}
+    assert len(errors) == 1
+
+
+def test_delete_then_create_are_both_sent() -> None:
+    registry = InFlightRegistry()
+    send = BlockingSender()
+    threads = [run_in_thread(registry, CREATE_SOLOON, send)]
+    send.wait_started()
+    threads += [run_in_thread(registry, DELETE, send)]
+    wait_for(lambda: len(registry._cells[(1, 1)].pending) == 1)
+    threads += [run_in_thread(registry, CREATE, send)]
+    wait_for(lambda: len(registry._cells[(1, 1)].pending) == 2)
+
+    send.release()
+    for thread in threads:
+        thread.join()
+
+    assert send.sent == [CREATE_SOLOON, DELETE, CREATE]
+
+
+def test_failure_is_shared() -> None:
+    registry = InFlightRegistry()
+    send = BlockingSender(fail=True)
+    errors: list[Exception] = []
+
+    def run() -> None:
+        try:
+            registry.run(CREATE, send)
+        except RuntimeError as e:
+            errors.append(e)
+
+    first = threading.Thread(target=run)
+    first.start()
+    send.wait_started()
+    second = threading.Thread(target=run)
+    second.start()
+    wait_for(lambda: registry.stats.deduplicated == 1)
+    send.release()
+    first.join()
+    second.join()
+
+    assert len(errors) == 2
+    assert send.sent == [CREATE]
+    with pytest.raises(RuntimeError):
+        registry.run(CREATE, send)
+
+
+def test_interrupted_sender_cancels_waiters() -> None:
+    registry = InFlightRegistry()
+    send = BlockingSender(fail=True, error=KeyboardInterrupt)
+    errors: list[BaseException] = []
+
+    def run(operation: Operation) -> None:
+        try:
+            registry.run(operation, send)
+        except BaseException as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=run, args=(CREATE,))]
+    threads[0].start()
+    send.wait_started()
+    threads += [threading.Thread(target=run, args=(operation,)) for operation in (CREATE, DELETE)]
+    threads[1].start()
+    wait_for(lambda: registry.stats.deduplicated == 1)
+    threads[2].start()
+    wait_for(lambda: len(registry._cells[(1, 1)].pending) == 1)
+
+    send.release()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(type(error).__name__ for error in errors) == ["CancelledError", "CancelledError", "KeyboardInterrupt"]
+    assert send.sent == [CREATE]
+    assert registry._cells == {}
+    send.fail = False
+    registry.run(DELETE, send)
+    assert send.sent == [CREATE, DELETE]
@@ -1,12 +1,23 @@
+from pathlib import Path
 from unittest.mock import Mock
 
 import pytest
 
 from crossmint.entities import AstralObject, Cometh, ComethDirection, Polyanet, Position, Soloon, SoloonColor
+from crossmint.index import TileIndex
 from crossmint.megaverse import Megaverse, MegaverseClient
+from crossmint.snapshot import MegaverseSnapshot
+from crossmint.validation import GoalValidationError
 
 
 class MockMegaverseClient(MegaverseClient):
+    create_polyanet: Mock
+    create_soloon: Mock
+    create_cometh: Mock
+    delete_polyanet: Mock
+    delete_soloon: Mock
+    delete_cometh: Mock
+
     def __init__(self) -> None:
         self.create_polyanet = Mock()
         self.create_soloon = Mock()
@@ -53,25 +64,57 @@ class TestMegaverse:
         with pytest.raises(ValueError, match="Unexpected value from goal"):
             empty_megaverse.load_goal([["INVALID_FORMAT_OBJECT"]])
 
-    def test_create_polyanet(self, empty_megaverse: Megaverse) -> None:
+    def test_load_goal_ragged(self, empty_megaverse: Megaverse) -> None:
+        with pytest.raises(ValueError, match=r"Goal rows \[1, 3\] do not have 2 columns"):
+            empty_megaverse.load_goal([["SPACE", "SPACE"], ["SPACE"], ["SPACE", "SPACE"], ["SPACE", "SPACE", "SPACE"]])
+
+    def test_validate_goal(self, empty_megaverse: Megaverse, sample_goal: list[list[str]]) -> None:
+        empty_megaverse.load_goal(sample_goal)
+        assert empty_megaverse.shape == (3, 3)
+
+        with pytest.raises(GoalValidationError) as exc_info:
+            empty_megaverse.validate_goal(empty_megaverse)
+        assert exc_info.value.violations == [
+            "Soloon at row=1 column=0 is not adjacent to a Polyanet",
+            "Soloon at row=2 column=1 is not adjacent to a Polyanet",
+        ]
+
+        empty_megaverse.load_goal([["POLYANET", "WHITE_SOLOON"]])
+        empty_megaverse.validate_goal(empty_megaverse)
+
+    def test_validate_goal_against_target(
+        self, empty_megaverse: Megaverse, client: MockMegaverseClient, tmp_path: Path
+    ) -> None:
+        empty_megaverse.load_goal([["POLYANET", "SPACE", "SPACE"]] * 3)
+        with MegaverseSnapshot.create(tmp_path / "megaverse.snapshot", rows=2, columns=2) as snapshot:
+            target = Megaverse.from_snapshot(snapshot, client)
+
+            with pytest.raises(GoalValidationError) as exc_info:
+                empty_megaverse.validate_goal(target)
+        assert exc_info.value.violations == [
+            "Goal size 3 x 3 does not match the 2 x 2 megaverse",
+            "row=2 column=0 is outside of the 2 x 2 megaverse",
+        ]
+
+    def test_create_polyanet(self, empty_megaverse: Megaverse, client: MockMegaverseClient) -> None:
         polyanet = Polyanet(position=Position(row=0, column=0))
         result = empty_megaverse._create_astral_object(polyanet)
 
-        empty_megaverse.client.create_polyanet.assert_called_once_with(polyanet)
+        client.create_polyanet.assert_called_once_with(polyanet)
         assert result == polyanet
 
-    def test_create_soloon(self, empty_megaverse: Megaverse) -> None:
+    def test_create_soloon(self, empty_megaverse: Megaverse, client: MockMegaverseClient) -> None:
         soloon = Soloon(position=Position(row=0, column=0), color=SoloonColor.WHITE)
         result = empty_megaverse._create_astral_object(soloon)
 
-        empty_megaverse.client.create_soloon.assert_called_once_with(soloon)
+        client.create_soloon.assert_called_once_with(soloon)
         assert result == soloon
 
-    def test_create_cometh(self, empty_megaverse: Megaverse) -> None:
+    def test_create_cometh(self, empty_megaverse: Megaverse, client: MockMegaverseClient) -> None:
         cometh = Cometh(position=Position(row=0, column=0), direction=ComethDirection.UP)
         result = empty_megaverse._create_astral_object(cometh)
 
-        empty_megaverse.client.create_cometh.assert_called_once_with(cometh)
+        client.create_cometh.assert_called_once_with(cometh)
         assert result == cometh
 
     def test_create_invalid_object(self, empty_megaverse: Megaverse) -> None:
@@ -81,25 +124,25 @@ class TestMegaverse:
         with pytest.raises(ValueError, match="Unhandled astral object type"):
             empty_megaverse._create_astral_object(mock_object)
 
-    def test_delete_polyanet(self, empty_megaverse: Megaverse) -> None:
+    def test_delete_polyanet(self, empty_megaverse: Megaverse, client: MockMegaverseClient) -> None:
         polyanet = Polyanet(position=Position(row=0, column=0))
         result = empty_megaverse._delete_astral_object(polyanet)
 
-        empty_megaverse.client.delete_polyanet.assert_called_once_with(polyanet)
+        client.delete_polyanet.assert_called_once_with(polyanet)
         assert result == polyanet
 
-    def test_delete_soloon(self, empty_megaverse: Megaverse) -> None:
+    def test_delete_soloon(self, empty_megaverse: Megaverse, client: MockMegaverseClient) -> None:
         soloon = Soloon(position=Position(row=0, column=0), color=SoloonColor.WHITE)
         result = empty_megaverse._delete_astral_object(soloon)
 
-        empty_megaverse.client.delete_soloon.assert_called_once_with(soloon)
+        client.delete_soloon.assert_called_once_with(soloon)
         assert result == soloon
 
-    def test_delete_cometh(self, empty_megaverse: Megaverse) -> None:
+    def test_delete_cometh(self, empty_megaverse: Megaverse, client: MockMegaverseClient) -> None:
         cometh = Cometh(position=Position(row=0, column=0), direction=ComethDirection.UP)
         result = empty_megaverse._delete_astral_object(cometh)
 
-        empty_megaverse.client.delete_cometh.assert_called_once_with(cometh)
+        client.delete_cometh.assert_called_once_with(cometh)
         assert result == cometh
 
     def test_delete_invalid_object(self, empty_megaverse: Megaverse) -> None:
@@ -137,8 +180,153 @@ class TestMegaverse:
         goal_objects: dict = {initial_position: Soloon(position=initial_position, color=SoloonColor.WHITE)}
         goal_megaverse = Megaverse(astral_objects=goal_objects, client=MockMegaverseClient())
 
-        megaverse.convert(goal_megaverse)
+        stats = megaverse.convert(goal_megaverse)
 
         client.delete_polyanet.assert_called_once()
         client.create_soloon.assert_called_once()
         assert megaverse.astral_objects == goal_objects
+        assert (stats.created, stats.deleted) == (1, 1)
+
+    def test_convert_only_changed_tiles(self, client: MockMegaverseClient) -> None:
+        initial_objects: dict = {
+            Position(row=row, column=column): Polyanet(position=Position(row=row, column=column))
+            for row in range(20)
+            for column in range(20)
+        }
+        megaverse = Megaverse(astral_objects=dict(initial_objects), client=client)
+        changed_position = Position(row=3, column=17)
+        goal_objects = {**initial_objects, changed_position: Soloon(position=changed_position, color=SoloonColor.RED)}
+        goal_megaverse = Megaverse(astral_objects=goal_objects, client=MockMegaverseClient())
+
+        megaverse.convert(goal_megaverse)
+
+        client.delete_polyanet.assert_called_once_with(initial_objects[changed_position])
+        client.create_soloon.assert_called_once_with(goal_objects[changed_position])
+        assert megaverse.astral_objects == goal_objects
+        assert megaverse.index.diff(goal_megaverse.index) == set()
+
+    def test_convert_after_assignment(self, client: MockMegaverseClient) -> None:
+        position = Position(row=0, column=0)
+        megaverse = Megaverse(astral_objects={}, client=client)
+        megaverse.astral_objects = {position: Polyanet(position=position)}
+
+        megaverse.convert(Megaverse(astral_objects={}, client=MockMegaverseClient()))
+
+        client.delete_polyanet.assert_called_once_with(Polyanet(position=position))
+        assert megaverse.astral_objects == {}
+
+    def test_megaverses_do_not_share_objects(self, client: MockMegaverseClient) -> None:
+        position = Position(row=0, column=0)
+        goal_megaverse = Megaverse(astral_objects={position: Polyanet(position=position)}, client=MockMegaverseClient())
+        megaverse = Megaverse(astral_objects=goal_megaverse.astral_objects, client=client)
+
+        megaverse.convert(Megaverse(astral_objects={}, client=MockMegaverseClient()))
+
+        assert megaverse.astral_objects == {}
+        assert goal_megaverse.astral_objects == {position: Polyanet(position=position)}
+        assert goal_megaverse.index.diff(TileIndex.build([Polyanet(position=position)])) == set()
+
+    def test_convert_after_item_mutation(self, client: MockMegaverseClient) -> None:
+        position = Position(row=0, column=0)
+        goal_objects: dict = {position: Polyanet(position=position)}
+        megaverse = Megaverse(astral_objects=dict(goal_objects), client=client)
+        goal_megaverse = Megaverse(astral_objects=goal_objects, client=MockMegaverseClient())
+        megaverse.astral_objects[position] = Soloon(position=position, color=SoloonColor.RED)
+
+        megaverse.convert(goal_megaverse)
+
+        client.delete_soloon.assert_called_once()
+        client.create_polyanet.assert_called_once()
+        assert megaverse.astral_objects == goal_objects
+
+    @pytest.mark.parametrize(
+        ("checks", "created", "deleted"),
+        [(0, 0, 0), (1, 0, 1), (2, 1, 1), (3, 2, 2)],
+        ids=["delete", "create", "check", "none"],
+    )
+    def test_convert_stops(self, client: MockMegaverseClient, checks: int, created: int, deleted: int) -> None:
+        positions = [Position(row=0, column=column) for column in range(3)]
+        megaverse = Megaverse(
+            astral_objects={position: Polyanet(position=position) for position in positions[:2]}, client=client
+        )
+        goal_objects: dict = {
+            positions[1]: Soloon(position=positions[1], color=SoloonColor.RED),
+            positions[2]: Polyanet(position=positions[2]),
+        }
+        calls: list[None] = []
+
+        def should_stop() -> bool:
+            calls.append(None)
+            return len(calls) > checks
+
+        stats = megaverse.convert(Megaverse(astral_objects=goal_objects, client=MockMegaverseClient()), should_stop)
+
+        assert (stats.created, stats.deleted, stats.interrupted) == (created, deleted, checks < 3)
+        assert client.delete_polyanet.call_count == deleted
+        assert len(megaverse.astral_objects) == 2 - deleted + created
+
+    def test_convert_identical(self, client: MockMegaverseClient, sample_goal: list[list[str]]) -> None:
+        megaverse = Megaverse(astral_objects={}, client=client)
+        megaverse.load_goal(sample_goal)
+        goal_megaverse = Megaverse(astral_objects={}, client=MockMegaverseClient())
+        goal_megaverse.load_goal(sample_goal)
+
+        megaverse.convert(goal_megaverse)
+
+        client.create_polyanet.assert_not_called()
+        client.delete_polyanet.assert_not_called()
+
+    def test_convert_updates_snapshot(self, client: MockMegaverseClient, tmp_path: Path) -> None:
+        position = Position(row=0, column=0)
+        with MegaverseSnapshot.create(tmp_path / "megaverse.snapshot", rows=2, columns=2) as snapshot:
+            snapshot.set(position, Polyanet(position=position))
+            megaverse = Megaverse.from_snapshot(snapshot, client)
+            assert megaverse.astral_objects == {position: Polyanet(position=position)}
+            assert megaverse.shape == (2, 2)
+
+            goal_objects: dict = {Position(row=1, column=1): Polyanet(position=Position(row=1, column=1))}
+            megaverse.convert(Megaverse(astral_objects=goal_objects, client=MockMegaverseClient()))
+
+            client.delete_polyanet.assert_called_once()
+            client.create_polyanet.assert_called_once()
+            assert snapshot.astral_objects() == goal_objects
+            assert snapshot.version == 3
+            assert snapshot.is_consistent()
+
+    def test_goal_larger_than_snapshot(self, client: MockMegaverseClient, tmp_path: Path) -> None:
+        with MegaverseSnapshot.create(tmp_path / "megaverse.snapshot", rows=2, columns=2) as snapshot:
+            megaverse = Megaverse.from_snapshot(snapshot, client)
+            goal_megaverse = Megaverse(astral_objects={}, client=MockMegaverseClient())
+            goal_megaverse.load_goal([["POLYANET", "SPACE", "SPACE"]] * 3)
+
+            with pytest.raises(ValueError, match=r"Goal size \(3, 3\) does not match the snapshot size \(2, 2\)"):
+                megaverse.convert(goal_megaverse)
+
+            client.create_polyanet.assert_not_called()
+            assert snapshot.version == 0
+
+    def test_goal_outside_of_snapshot(self, client: MockMegaverseClient, tmp_path: Path) -> None:
+        with MegaverseSnapshot.create(tmp_path / "megaverse.snapshot", rows=2, columns=2) as snapshot:
+            megaverse = Megaverse.from_snapshot(snapshot, client)
+            goal_objects: dict = {
+                Position(row=0, column=0): Polyanet(position=Position(row=0, column=0)),
+                Position(row=0, column=2): Polyanet(position=Position(row=0, column=2)),
+            }
+
+            with pytest.raises(ValueError, match=r"Goal positions \[\(0, 2\)\] are outside"):
+                megaverse.convert(Megaverse(astral_objects=goal_objects, client=MockMegaverseClient()))
+
+            client.create_polyanet.assert_not_called()
+            assert snapshot.version == 0
+
+    def test_failed_operation_not_in_snapshot(self, client: MockMegaverseClient, tmp_path: Path) -> None:
+        client.create_polyanet.side_effect = RuntimeError("API error")
+        with MegaverseSnapshot.create(tmp_path / "megaverse.snapshot", rows=2, columns=2) as snapshot:
+            megaverse = Megaverse.from_snapshot(snapshot, client)
+            goal_objects: dict = {Position(row=1, column=1): Polyanet(position=Position(row=1, column=1))}
+
+            with pytest.raises(RuntimeError):
+                megaverse.convert(Megaverse(astral_objects=goal_objects, client=MockMegaverseClient()))
+
+            assert snapshot.astral_objects() == {}
+            assert snapshot.version == 0
@@ -0,0 +1,162 @@
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from crossmint.client import MegaverseClient
+from crossmint.entities import Polyanet, Position
+from crossmint.megaverse import Megaverse
+from crossmint.reconciler import CycleStats, Reconciler
+from crossmint.snapshot import MegaverseSnapshot
+from crossmint.transport import InMemoryTransport, Method
+from crossmint.urls import POLYANETS_ENDPOINT, SOLOONS_ENDPOINT
+
+
+@pytest.fixture
+def transport() -> InMemoryTransport:
+    return InMemoryTransport(goal=[["POLYANET", "SPACE"], ["SPACE", "SPACE"]])
+
+
+@pytest.fixture
+def reconciler(transport: InMemoryTransport) -> Reconciler:
+    client = MegaverseClient(candidate_id="test_id", transport=transport)
+    return Reconciler(Megaverse(astral_objects={}, client=client), interval=0)
+
+
+def test_cycle_stats_str() -> None:
+    assert str(CycleStats(cycle=1, duration=0.5)) == "Cycle 1: goal unchanged in 0.50s"
+    assert str(CycleStats(cycle=2, changed=True, created=3, deleted=1)) == (
+        "Cycle 2: goal changed, 3 created, 1 deleted in 0.00s"
+    )
+    assert str(CycleStats(cycle=3, failed=True)) == "Cycle 3: failed in 0.00s"
+    assert str(CycleStats(cycle=4, changed=True, interrupted=True, created=1)) == (
+        "Cycle 4: interrupted, 1 created, 0 deleted in 0.00s"
+    )
+
+
+def test_first_cycle_converts(reconciler: Reconciler, transport: InMemoryTransport) -> None:
+    stats = reconciler.run_cycle()
+
+    assert (stats.cycle, stats.changed, stats.created, stats.deleted) == (1, True, 1, 0)
+    assert transport.objects.keys() == {(POLYANETS_ENDPOINT, 0, 0)}
+    assert reconciler.current.astral_objects == {
+        Position(row=0, column=0): Polyanet(position=Position(row=0, column=0))
+    }
+
+
+def test_unchanged_goal_sends_no_operation(reconciler: Reconciler, transport: InMemoryTransport) -> None:
+    reconciler.run_cycle()
+    transport.requests.clear()
+
+    stats = reconciler.run_cycle()
+
+    assert not stats.changed
+    assert [method for method, _, _ in transport.requests] == [Method.GET]
+
+
+def test_changed_goal_applies_delta(reconciler: Reconciler, transport: InMemoryTransport) -> None:
+    reconciler.run_cycle()
+    transport.goal = [["POLYANET", "SPACE"], ["RED_SOLOON", "SPACE"]]
+    transport.requests.clear()
+
+    stats = reconciler.run_cycle()
+
+    assert (stats.changed, stats.created, stats.deleted) == (True, 1, 0)
+    assert [method for method, _, _ in transport.requests] == [Method.GET, Method.POST]
+    assert transport.objects.keys() == {(POLYANETS_ENDPOINT, 0, 0), (SOLOONS_ENDPOINT, 1, 0)}
+
+
+def test_failed_cycle_is_retried(reconciler: Reconciler, transport: InMemoryTransport) -> None:
+    transport.failures = [500]
+
+    assert reconciler.run_cycle().failed
+    stats = reconciler.run_cycle()
+
+    assert not stats.failed
+    assert stats.changed
+    assert transport.objects.keys() == {(POLYANETS_ENDPOINT, 0, 0)}
+
+
+def test_run(reconciler: Reconciler, monkeypatch: pytest.MonkeyPatch) -> None:
+    waits: list[float] = []
+    monkeypatch.setattr(reconciler._stop, "wait", waits.append)
+
+    reconciler.run(max_cycles=3)
+
+    assert reconciler.cycles == 3
+    assert waits == [0, 0]
+    assert not reconciler.stopped
+
+
+def test_stop(reconciler: Reconciler) -> None:
+    reconciler.stop()
+    reconciler.run()
+
+    assert reconciler.stopped
+    assert reconciler.cycles == 0
+
+
+def test_goal_not_fitting_current_is_rejected(transport: InMemoryTransport, tmp_path: Path) -> None:
+    client = MegaverseClient(candidate_id="test_id", transport=transport)
+    with MegaverseSnapshot.create(tmp_path / "megaverse.snapshot", rows=2, columns=2) as snapshot:
+        reconciler = Reconciler(Megaverse.from_snapshot(snapshot, client), interval=0)
+        transport.goal = [["POLYANET", "SPACE", "SPACE"]] * 3
+
+        assert reconciler.run_cycle().failed
+        assert [method for method, _, _ in transport.requests] == [Method.GET]
+        assert snapshot.version == 0
+
+
+def test_invalid_goal_is_not_retried(reconciler: Reconciler, transport: InMemoryTransport) -> None:
+    transport.goal = [["SPACE", "RED_SOLOON"]]
+
+    assert reconciler.run_cycle().failed
+    stats = reconciler.run_cycle()
+
+    assert not stats.failed
+    assert not stats.changed
+    assert [method for method, _, _ in transport.requests] == [Method.GET, Method.GET]
+
+
+@pytest.mark.parametrize("content", [b'{"error": "not found"}', b"[]", b"not json"], ids=["key", "type", "json"])
+def test_malformed_goal_is_not_retried(reconciler: Reconciler, transport: InMemoryTransport, content: bytes) -> None:
+    transport.request = lambda *args, **kwargs: content  # type: ignore[method-assign]
+
+    assert reconciler.run_cycle().failed
+    stats = reconciler.run_cycle()
+
+    assert not stats.failed
+    assert not stats.changed
+
+
+def test_convert_errors_are_raised(reconciler: Reconciler, monkeypatch: pytest.MonkeyPatch) -> None:
+    def convert(self: Megaverse, goal_megaverse: Megaverse, should_stop: Any = None) -> None:
+        raise ValueError("convert bug")
+
+    monkeypatch.setattr(Megaverse, "convert", convert)
+
+    with pytest.raises(ValueError, match="convert bug"):
+        reconciler.run_cycle()
+
+
+def test_stop_interrupts_convert(reconciler: Reconciler, transport: InMemoryTransport) -> None:
+    transport.goal = [["POLYANET", "SPACE"], ["SPACE", "POLYANET"]]
+    request = transport.request
+
+    def request_then_stop(*args: Any, **kwargs: Any) -> bytes:
+        content = request(*args, **kwargs)
+        if args[0] is Method.POST:
+            reconciler.stop()
+        return content
+
+    transport.request = request_then_stop  # type: ignore[method-assign]
+
+    stats = reconciler.run_cycle()
+
+    assert (stats.changed, stats.interrupted, stats.created) == (True, True, 1)
+    assert len(transport.objects) == 1
+    reconciler._stop.clear()
+    transport.request = request  # type: ignore[method-assign]
+    stats = reconciler.run_cycle()
+    assert (stats.changed, stats.interrupted, stats.created) == (True, False, 1)
+    assert len(transport.objects) == 2
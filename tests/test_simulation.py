@@ -0,0 +1,59 @@
+import pytest
+from requests import exceptions
+from tenacity import wait_fixed
+
+from crossmint.clock import SimulatedClock
+from crossmint.simulation import SimulationReport, ThrottledTransport, simulate
+from crossmint.transport import Method
+
+
+class TestThrottledTransport:
+    def test_rate_limit(self) -> None:
+        clock = SimulatedClock()
+        transport = ThrottledTransport(clock, rate=1.0, burst=2, latency=0.1)
+        body = b'{"row": 0, "column": 0}'
+
+        transport.request(Method.POST, "http://megaverse/polyanets", body)
+        transport.request(Method.POST, "http://megaverse/polyanets", body)
+        with pytest.raises(exceptions.HTTPError) as exc_info:
+            transport.request(Method.POST, "http://megaverse/polyanets", body)
+        assert exc_info.value.response.status_code == 429
+
+        clock.advance(1.0)
+        transport.request(Method.DELETE, "http://megaverse/polyanets", body)
+
+        assert transport.throttled == 1
+        assert len(transport.requests) == 4
+        assert clock.monotonic() == pytest.approx(1.4)
+        assert transport.objects == {}
+
+
+def test_report_str() -> None:
+    report = SimulationReport(
+        operations=10, requests=12, throttled=2, failed_operations=0, rounds=1, elapsed=7200, completed=True
+    )
+    assert str(report) == (
+        "10 operations completed in 2.00h over 1 rounds: 12 requests, 2 throttled, 0 operations out of retries"
+    )
+
+
+def test_simulate_hours_of_traffic() -> None:
+    goal = [["POLYANET"] * 30 for _ in range(30)]
+
+    report = simulate(goal, rate=0.25, burst=1, latency=0.1)
+
+    assert report.completed
+    assert report.operations == 900
+    assert report.requests == 900 + report.throttled
+    assert report.elapsed > 3600
+
+
+def test_simulate_out_of_retries() -> None:
+    goal = [["POLYANET"] * 3]
+
+    report = simulate(goal, rate=0.01, burst=1, latency=0.1, retry_wait=wait_fixed(1), max_rounds=2)
+
+    assert not report.completed
+    assert report.rounds == 2
+    assert report.failed_operations == 2
+    assert "NOT completed" in str(report)
@@ -0,0 +1,169 @@
+from pathlib import Path
+
+import pytest
+
+from crossmint.entities import (
+    AstralObject,
+    AstralObjectType,
+    Cometh,
+    ComethDirection,
+    Polyanet,
+    Position,
+    Soloon,
+    SoloonColor,
+)
+from crossmint.snapshot import (
+    FORMAT_VERSION,
+    HEADER,
+    MegaverseSnapshot,
+    checksum,
+    decode,
+    encode,
+    megaverse_digest,
+    open_snapshot,
+)
+
+MEGAVERSE = megaverse_digest("https://challenge.crossmint.io/api", "test_id")
+
+
+@pytest.fixture
+def path(tmp_path: Path) -> Path:
+    return tmp_path / "megaverse.snapshot"
+
+
+@pytest.fixture
+def astral_objects() -> dict:
+    return {
+        Position(row=0, column=1): Polyanet(position=Position(row=0, column=1)),
+        Position(row=1, column=0): Soloon(position=Position(row=1, column=0), color=SoloonColor.PURPLE),
+        Position(row=1, column=2): Cometh(position=Position(row=1, column=2), direction=ComethDirection.LEFT),
+    }
+
+
+def test_encode_decode(astral_objects: dict) -> None:
+    for position, astral_object in astral_objects.items():
+        assert decode(encode(astral_object), position) == astral_object
+    assert encode(None) == 0
+    assert decode(0, Position(row=0, column=0)) is None
+
+
+def test_encode_decode_invalid() -> None:
+    with pytest.raises(ValueError, match="Unhandled astral object type"):
+        encode(AstralObject(type=AstralObjectType.SPACE, position=Position(row=0, column=0)))
+    with pytest.raises(ValueError, match="Unexpected cell code"):
+        decode(255, Position(row=0, column=0))
+
+
+def test_create_and_reopen(path: Path, astral_objects: dict) -> None:
+    with MegaverseSnapshot.create(path, rows=2, columns=3, megaverse=MEGAVERSE) as snapshot:
+        assert snapshot.version == 0
+        assert snapshot.astral_objects() == {}
+        for position, astral_object in astral_objects.items():
+            snapshot.set(position, astral_object)
+        snapshot.set(Position(row=0, column=0), None)
+        snapshot.flush()
+        assert snapshot.version == 4
+
+    with MegaverseSnapshot(path) as snapshot:
+        assert repr(snapshot) == f"MegaverseSnapshot(path='{path}', rows=2, columns=3)"
+        assert snapshot.is_consistent()
+        assert snapshot.version == 4
+        assert snapshot.megaverse == MEGAVERSE
+        assert snapshot.astral_objects() == astral_objects
+        assert snapshot.get(Position(row=0, column=1)) == astral_objects[Position(row=0, column=1)]
+        assert snapshot.get(Position(row=0, column=0)) is None
+
+
+def test_checksum_is_updated_incrementally(path: Path, astral_objects: dict) -> None:
+    with MegaverseSnapshot.create(path, rows=2, columns=3) as snapshot:
+        for position, astral_object in astral_objects.items():
+            snapshot.set(position, astral_object)
+            assert snapshot.is_consistent()
+        snapshot.set(Position(row=1, column=2), None)
+        assert snapshot.is_consistent()
+
+    grid = path.read_bytes()[HEADER.size :]
+    assert HEADER.unpack_from(path.read_bytes())[5] == checksum(grid)
+    assert checksum(bytes([1, 0])) != checksum(bytes([0, 1]))
+
+
+def test_out_of_bounds(path: Path) -> None:
+    with MegaverseSnapshot.create(path, rows=2, columns=3) as snapshot:
+        with pytest.raises(ValueError, match="outside of the 2 x 3 snapshot"):
+            snapshot.set(Position(row=2, column=0), None)
+        with pytest.raises(ValueError, match="outside of the 2 x 3 snapshot"):
+            snapshot.get(Position(row=0, column=3))
+
+
+def test_drift_is_detected(path: Path) -> None:
+    MegaverseSnapshot.create(path, rows=2, columns=3).close()
+    data = bytearray(path.read_bytes())
+    data[HEADER.size] = 1
+    path.write_bytes(bytes(data))
+
+    with MegaverseSnapshot(path) as snapshot:
+        assert not snapshot.is_consistent()
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        b"",
+        b"not a snapshot" * 4,
+        HEADER.pack(b"MGVS", 1, 0, 2, 3, 0, MEGAVERSE),
+        HEADER.pack(b"MGVS", FORMAT_VERSION, 0, 2, 3, 0, MEGAVERSE),
+    ],
+    ids=["empty", "magic", "version", "truncated"],
+)
+def test_invalid_files(path: Path, content: bytes) -> None:
+    path.write_bytes(content)
+    with pytest.raises(ValueError):
+        MegaverseSnapshot(path)
+
+
+class TestOpenSnapshot:
+    def test_missing(self, path: Path) -> None:
+        with open_snapshot(path, rows=2, columns=3, megaverse=MEGAVERSE) as snapshot:
+            assert (snapshot.rows, snapshot.columns) == (2, 3)
+        assert path.exists()
+
+    def test_existing(self, path: Path, astral_objects: dict) -> None:
+        with MegaverseSnapshot.create(path, rows=2, columns=3, megaverse=MEGAVERSE) as snapshot:
+            for position, astral_object in astral_objects.items():
+                snapshot.set(position, astral_object)
+
+        with open_snapshot(path, rows=2, columns=3, megaverse=MEGAVERSE) as snapshot:
+            assert snapshot.astral_objects() == astral_objects
+
+    def test_size_mismatch(self, path: Path, astral_objects: dict) -> None:
+        with MegaverseSnapshot.create(path, rows=2, columns=3, megaverse=MEGAVERSE) as snapshot:
+            snapshot.set(Position(row=0, column=0), astral_objects[Position(row=0, column=1)])
+
+        with open_snapshot(path, rows=3, columns=3, megaverse=MEGAVERSE) as snapshot:
+            assert (snapshot.rows, snapshot.columns) == (3, 3)
+            assert snapshot.astral_objects() == {}
+
+    def test_other_megaverse(self, path: Path, astral_objects: dict) -> None:
+        other = megaverse_digest("https://challenge.crossmint.io/api", "other_id")
+        with MegaverseSnapshot.create(path, rows=2, columns=3, megaverse=other) as snapshot:
+            snapshot.set(Position(row=0, column=1), astral_objects[Position(row=0, column=1)])
+
+        with open_snapshot(path, rows=2, columns=3, megaverse=MEGAVERSE) as snapshot:
+            assert snapshot.megaverse == MEGAVERSE
+            assert snapshot.astral_objects() == {}
+
+    def test_inconsistent(self, path: Path) -> None:
+        MegaverseSnapshot.create(path, rows=2, columns=3, megaverse=MEGAVERSE).close()
+        data = bytearray(path.read_bytes())
+        data[HEADER.size] = 1
+        path.write_bytes(bytes(data))
+
+        with open_snapshot(path, rows=2, columns=3, megaverse=MEGAVERSE) as snapshot:
+            assert snapshot.is_consistent()
+            assert snapshot.astral_objects() == {}
+
+    def test_invalid(self, path: Path) -> None:
+        path.write_bytes(b"")
+
+        with open_snapshot(path, rows=2, columns=3, megaverse=MEGAVERSE) as snapshot:
+            assert snapshot.is_consistent()
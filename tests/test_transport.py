@@ -0,0 +1,130 @@
+import json
+import threading
+import time
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from requests import exceptions
+
+from crossmint.entities import Position
+from crossmint.transport import (
+    InMemoryTransport,
+    Method,
+    Operation,
+    RequestsTransport,
+    Transport,
+    Urllib3Transport,
+)
+
+
+class MegaverseHandler(BaseHTTPRequestHandler):
+    """Echoes JSON bodies back; `/error` answers 400, `/slow` answers after a delay and `/drop` never answers."""
+
+    def _respond(self) -> None:
+        if self.path.endswith("/drop"):
+            self.close_connection = True
+            return
+        if self.path.endswith("/slow"):
+            time.sleep(0.5)
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        status = 400 if self.path.endswith("/error") else 200
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.end_headers()
+        try:
+            self.wfile.write(json.dumps({"method": self.command, "data": json.loads(body) if body else None}).encode())
+        except BrokenPipeError:
+            pass
+
+    do_GET = do_POST = do_DELETE = _respond
+
+    def log_message(self, format: str, *args: object) -> None:
+        return None
+
+
+@pytest.fixture(scope="module")
+def server_url() -> Iterator[str]:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), MegaverseHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture(params=[RequestsTransport, Urllib3Transport])
+def transport(request: pytest.FixtureRequest) -> Iterator[Transport]:
+    transport: Transport = request.param()
+    yield transport
+    transport.close()
+
+
+def test_operation_hash() -> None:
+    operation = Operation(
+        method=Method.POST,
+        endpoint="soloons",
+        position=Position(row=1, column=2),
+        attributes=(("color", "red"),),
+    )
+    assert hash(operation) == hash(operation.model_copy())
+
+
+def test_request(transport: Transport, server_url: str) -> None:
+    content = transport.request(Method.POST, f"{server_url}/polyanets", b'{"row": 1}', (1.0, 1.0))
+    assert json.loads(content) == {"method": "POST", "data": {"row": 1}}
+
+    content = transport.request(Method.GET, f"{server_url}/map")
+    assert json.loads(content) == {"method": "GET", "data": None}
+
+
+def test_request_error(transport: Transport, server_url: str) -> None:
+    with pytest.raises(exceptions.HTTPError) as exc_info:
+        transport.request(Method.DELETE, f"{server_url}/error", b'{"row": 1}')
+    assert exc_info.value.response.status_code == 400
+
+
+def test_request_timeout(transport: Transport, server_url: str) -> None:
+    with pytest.raises(exceptions.Timeout):
+        transport.request(Method.GET, f"{server_url}/slow", timeout=(1.0, 0.05))
+
+
+def test_request_connection_error(transport: Transport) -> None:
+    with pytest.raises(exceptions.ConnectionError):
+        transport.request(Method.GET, "http://127.0.0.1:1/map", timeout=(1.0, 1.0))
+
+
+def test_request_dropped(transport: Transport, server_url: str) -> None:
+    with pytest.raises(exceptions.ConnectionError):
+        transport.request(Method.GET, f"{server_url}/drop", timeout=(1.0, 1.0))
+
+
+def test_base_transport_close() -> None:
+    transport = InMemoryTransport()
+    transport.close()
+    assert transport.requests == []
+
+
+class TestInMemoryTransport:
+    def test_objects(self) -> None:
+        transport = InMemoryTransport()
+        transport.request(Method.POST, "http://megaverse/polyanets", b'{"row": 1, "column": 2}')
+        transport.request(Method.POST, "http://megaverse/soloons", b'{"row": 0, "column": 0, "color": "red"}')
+        transport.request(Method.DELETE, "http://megaverse/polyanets", b'{"row": 1, "column": 2}')
+
+        assert transport.objects == {("soloons", 0, 0): {"row": 0, "column": 0, "color": "red"}}
+        assert len(transport.requests) == 3
+
+    def test_goal(self) -> None:
+        transport = InMemoryTransport(goal=[["SPACE"]])
+        assert json.loads(transport.request(Method.GET, "http://megaverse/map/id/goal")) == {"goal": [["SPACE"]]}
+
+    def test_failures(self) -> None:
+        transport = InMemoryTransport(failures=[429])
+        with pytest.raises(exceptions.HTTPError) as exc_info:
+            transport.request(Method.POST, "http://megaverse/polyanets", b'{"row": 1, "column": 2}')
+
+        assert exc_info.value.response.status_code == 429
+        assert transport.objects == {}
+        transport.request(Method.POST, "http://megaverse/polyanets", b'{"row": 1, "column": 2}')
+        assert transport.objects == {("polyanets", 1, 2): {"row": 1, "column": 2}}
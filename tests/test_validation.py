@@ -0,0 +1,59 @@
+import pytest
+
+from crossmint.entities import AstralObjectType, Cometh, ComethDirection, Polyanet, Position, Soloon, SoloonColor
+from crossmint.validation import GoalValidationError, NeighbourIndex, validate
+
+
+def polyanet(row: int, column: int) -> Polyanet:
+    return Polyanet(position=Position(row=row, column=column))
+
+
+def soloon(row: int, column: int) -> Soloon:
+    return Soloon(position=Position(row=row, column=column), color=SoloonColor.BLUE)
+
+
+def as_map(*astral_objects: Polyanet | Soloon | Cometh) -> dict:
+    return {astral_object.position: astral_object for astral_object in astral_objects}
+
+
+class TestNeighbourIndex:
+    def test_neighbours(self) -> None:
+        cometh = Cometh(position=Position(row=1, column=2), direction=ComethDirection.UP)
+        index = NeighbourIndex(as_map(polyanet(0, 1), soloon(1, 1), cometh, polyanet(2, 2)))
+
+        assert set(index.neighbours(Position(row=1, column=1))) == {
+            AstralObjectType.POLYANET,
+            AstralObjectType.COMETH,
+        }
+        assert index.has_neighbour(Position(row=1, column=1), AstralObjectType.POLYANET)
+        assert not index.has_neighbour(Position(row=2, column=2), AstralObjectType.POLYANET)
+        assert list(index.neighbours(Position(row=5, column=5))) == []
+
+
+class TestValidate:
+    def test_valid(self) -> None:
+        validate(as_map(polyanet(0, 0), soloon(0, 1), soloon(1, 0)), shape=(2, 2))
+        validate({}, shape=None)
+
+    def test_soloon_without_polyanet(self) -> None:
+        with pytest.raises(GoalValidationError, match="Soloon at row=1 column=1 is not adjacent to a Polyanet"):
+            validate(as_map(polyanet(0, 0), soloon(1, 1)), shape=(2, 2))
+
+    def test_out_of_bounds(self) -> None:
+        with pytest.raises(GoalValidationError, match="is outside of the 2 x 2 megaverse"):
+            validate(as_map(polyanet(2, 0)), shape=(2, 2))
+
+    def test_goal_size_mismatch(self) -> None:
+        with pytest.raises(GoalValidationError, match="Goal size 3 x 2 does not match the 2 x 2 megaverse"):
+            validate(as_map(polyanet(0, 0)), shape=(2, 2), goal_shape=(3, 2))
+        validate(as_map(polyanet(0, 0)), shape=None, goal_shape=(3, 2))
+
+    def test_bounds_unknown(self) -> None:
+        validate(as_map(polyanet(20, 0)), shape=None)
+
+    def test_reports_every_violation(self) -> None:
+        with pytest.raises(GoalValidationError) as exc_info:
+            validate(as_map(polyanet(0, 5), soloon(1, 1), soloon(3, 3)), shape=(2, 2))
+
+        assert len(exc_info.value.violations) == 4
+        assert str(exc_info.value).startswith("Invalid goal, 4 violations: ")